@@ -1,9 +1,32 @@
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+logger = logging.getLogger(__name__)
+
+
+def _is_gevent_worker():
+    """True when running under `celery worker -P gevent` (which monkey-patches before this import)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def _make_psycopg_green():
+    """Let psycopg2 yield to other greenlets while waiting on Postgres (gevent pool only)."""
+    if _is_gevent_worker():
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+_make_psycopg_green()
+
 app = Celery('kidbea_ml')
 
 # Load configuration from Django settings, all keys in it that are in uppercase
@@ -18,24 +41,87 @@ app.conf.update(
     broker_connection_retry=True,
     # Result backend settings
     result_expires=3600,  # Results expire after 1 hour
-    # Task settings
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # Task settings (serializers come from CELERY_* settings)
+    # Tasks sent from this worker (forecast fan-out, refreshes) go to ml_tasks unless routed
+    task_default_queue='ml_tasks',
     timezone='UTC',
     enable_utc=True,
     # Worker settings - ML tasks are CPU intensive
     worker_prefetch_multiplier=1,
-    worker_max_tasks_per_child=500,  # Lower than standard (more frequent cleanup)
+    worker_max_tasks_per_child=2000,  # Backstop; memory limit below drives recycling
+    worker_max_memory_per_child=int(os.getenv('WORKER_MAX_MEMORY_PER_CHILD_KB', 512000)),  # ~500 MB
     # Task timeout (in seconds)
     task_soft_time_limit=1800,  # 30 minutes soft limit (ML tasks are longer)
     task_time_limit=2700,  # 45 minutes hard limit
 )
 
-# Task routing - only listen to ml_tasks queue
+# Task routing - CPU-bound tasks on ml_tasks (prefork), I/O-bound data collection
+# on ml_io (gevent pool, see Procfile)
 app.conf.task_queues = (
     ('ml_tasks', {'exchange': 'ml', 'routing_key': 'ml_tasks'}),
+    ('ml_io', {'exchange': 'ml', 'routing_key': 'ml_io'}),
 )
+app.conf.task_routes = {
+    'forecasting.tasks.collect_weather_data': {'queue': 'ml_io'},
+    'forecasting.tasks.collect_trends_data': {'queue': 'ml_io'},
+    'forecasting.tasks.update_festival_calendar': {'queue': 'ml_io'},
+}
+
+
+@worker_init.connect
+def preload_heavy_modules(**kwargs):
+    """Import ML libraries in the parent so forked children share them copy-on-write."""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import forecasting.services.feature_engineering  # noqa: F401
+    import forecasting.services.prediction_service  # noqa: F401
+
+
+@worker_process_init.connect
+def reset_feature_caches(**kwargs):
+    """Start each worker child with fresh, pre-warmed in-process feature caches."""
+    from forecasting.services.feature_engineering import clear_multiplier_caches, warm_multiplier_caches
+    clear_multiplier_caches()
+    warm_multiplier_caches()
+
+
+def _warm_static_data():
+    """Load festival and seasonal data into this process's memo before the first task."""
+    from forecasting.utils.data_loaders import load_festival_calendar, load_seasonal_patterns
+    load_festival_calendar()
+    load_seasonal_patterns()
+
+
+@worker_process_init.connect
+def warm_child_connections(**kwargs):
+    """
+    Open each prefork child's own DB connection (sockets must not be shared
+    across fork) and load static data, so the first task skips the handshakes.
+    """
+    from django.db import connection
+    try:
+        connection.ensure_connection()
+    except Exception as e:
+        logger.warning(f"Could not pre-open database connection: {e}")
+    _warm_static_data()
+
+
+@worker_init.connect
+def warm_io_worker_connections(**kwargs):
+    """
+    The gevent pool doesn't fork, so the I/O worker pre-opens the shared
+    Open-Meteo keep-alive connection at boot. DB connections are per greenlet
+    (and not kept, DB_CONN_MAX_AGE=0), so they aren't warmed here.
+    """
+    if not _is_gevent_worker():
+        return
+
+    from forecasting.services.weather_service import OPENMETEO_FORECAST_URL, WeatherDataCollector
+    try:
+        WeatherDataCollector._get_shared_session().head(OPENMETEO_FORECAST_URL, timeout=5)
+    except Exception as e:
+        logger.warning(f"Could not pre-open Open-Meteo connection: {e}")
+    _warm_static_data()
 
 
 @app.task(bind=True)
@@ -37,7 +37,21 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
-        'CONN_MAX_AGE': 600,
+        # Connections are pooled by PgBouncer (e.g. the Supabase pooler on 6543);
+        # keep one persistent connection per worker thread and verify it before reuse.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # Transaction-mode poolers don't support server-side cursors
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'True') == 'True',
+    }
+}
+
+# Cache shared by all worker processes (forecasts, features, geocodes, trends)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_REDIS_URL', os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')),
+        'KEY_PREFIX': 'kidbea_ml',
     }
 }
 
@@ -50,9 +64,13 @@ USE_TZ = True
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_ACCEPT_CONTENT = ['json']
-CELERY_RESULT_SERIALIZER = 'json'
+# msgpack is smaller and faster than JSON; JSON stays accepted for producers that still send it
+CELERY_TASK_SERIALIZER = os.getenv('CELERY_TASK_SERIALIZER', 'msgpack')
+CELERY_ACCEPT_CONTENT = ['json', 'msgpack']
+# Results stay JSON: kidbea_wh reads them from the result backend and only accepts JSON
+CELERY_RESULT_SERIALIZER = os.getenv('CELERY_RESULT_SERIALIZER', 'json')
+CELERY_BROKER_TRANSPORT_OPTIONS = {'socket_keepalive': True, 'retry_on_timeout': True}
+CELERY_RESULT_BACKEND_TRANSPORT_OPTIONS = {'socket_keepalive': True, 'retry_on_timeout': True}
 CELERY_TIMEZONE = 'UTC'
 CELERY_ENABLE_UTC = True
 
@@ -62,6 +80,8 @@ FORECAST_HORIZON_DAYS = int(os.getenv('FORECAST_HORIZON_DAYS', 30))
 FORECAST_CONFIDENCE_LEVEL = float(os.getenv('FORECAST_CONFIDENCE_LEVEL', 0.95))
 MIN_HISTORY_DAYS = int(os.getenv('MIN_HISTORY_DAYS', 30))
 REORDER_POINT_MULTIPLIER = float(os.getenv('REORDER_POINT_MULTIPLIER', 1.5))
+# Threads used by PredictionService for multi-SKU forecasts (1 = serial; keep within the DB pool size)
+FORECAST_MAX_WORKERS = int(os.getenv('FORECAST_MAX_WORKERS', 4))
 
 # Create model cache directory
 Path(ML_MODEL_CACHE_DIR).mkdir(parents=True, exist_ok=True)
@@ -4,25 +4,113 @@ Creates features from external data sources and product history.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
+import numpy as np
 from django.utils import timezone
-from django.db.models import Avg, Sum, Count, Q
+from django.db.models import Avg, Q
 from django.core.cache import cache
 
+from forecasting.models import ExternalDataSource, HistoricalSalesDaily
+from variant.models import ProductVariant
 from forecasting.utils.data_loaders import (
+    MONTH_TO_SEASON,
     get_upcoming_festivals,
     get_seasonal_multiplier,
     get_day_of_week_multiplier,
     get_month_multiplier,
-    get_festival_impact,
     get_product_lifecycle_multiplier,
+    get_static_data_version,
     get_temperature_impact,
+    get_temperature_impact_batch,
     get_weather_impact
 )
 
 logger = logging.getLogger(__name__)
 
+# create_features_for_sku results. Weather/trends ingest bumps the version key;
+# sales are ingested by kidbea_wh, so new sales show up only after it runs the
+# invalidate_feature_cache task or this timeout passes.
+FEATURES_CACHE_TIMEOUT = 900
+FEATURES_CACHE_VERSION_KEY = "forecasting:features:version"
+HISTORICAL_ROWS_CHUNK_SIZE = 5000
+
+
+# Memoized static-data multipliers (only a handful of distinct inputs per process),
+# keyed on get_static_data_version() so edited static data is picked up
+@lru_cache(maxsize=32)
+def _day_of_week_multiplier(weekday: int, version: Tuple) -> float:
+    return get_day_of_week_multiplier(weekday)
+
+
+@lru_cache(maxsize=32)
+def _month_multiplier(month: int, version: Tuple) -> float:
+    return get_month_multiplier(month)
+
+
+@lru_cache(maxsize=512)
+def _seasonal_multiplier(category: str, month: int, version: Tuple) -> float:
+    return get_seasonal_multiplier(category, month)
+
+
+def clear_multiplier_caches():
+    """Clear memoized static-data multipliers (called on worker process start)."""
+    _day_of_week_multiplier.cache_clear()
+    _month_multiplier.cache_clear()
+    _seasonal_multiplier.cache_clear()
+    _get_parsed_upcoming_festivals.cache_clear()
+
+
+def warm_multiplier_caches():
+    """Pre-populate the day-of-week and month multiplier caches."""
+    try:
+        version = get_static_data_version()
+        for weekday in range(7):
+            _day_of_week_multiplier(weekday, version)
+        for month in range(1, 13):
+            _month_multiplier(month, version)
+    except Exception as e:
+        logger.warning("Error warming multiplier caches: %s", e)
+
+
+class FestivalIndex(NamedTuple):
+    """Upcoming festivals sorted by date, with dates split out for bisect lookups."""
+    festivals: Tuple[Dict[str, Any], ...]
+    dates: Tuple[date, ...]
+    max_window: int
+
+
+EMPTY_FESTIVAL_INDEX = FestivalIndex(festivals=(), dates=(), max_window=0)
+
+
+@lru_cache(maxsize=1)
+def _get_parsed_upcoming_festivals(today: date, version: Tuple) -> FestivalIndex:
+    """
+    Get festivals in the next 60 days with dates parsed once.
+    Cached per day (and static data version) so repeated feature builds skip
+    the calendar lookup and strptime.
+    """
+    festivals = sorted(
+        (
+            {
+                'date': datetime.strptime(festival['festival_date'], '%Y-%m-%d').date(),
+                'name': festival['name'],
+                'mult': festival.get('demand_multiplier', 1.0),
+                'window': festival.get('impact_window_days', 7)
+            }
+            for festival in get_upcoming_festivals(days_ahead=60)
+        ),
+        key=itemgetter('date')
+    )
+    return FestivalIndex(
+        festivals=tuple(festivals),
+        dates=tuple(festival['date'] for festival in festivals),
+        max_window=max((festival['window'] for festival in festivals), default=0)
+    )
+
 
 class FeatureEngineer:
     """Create features for forecasting models from multiple data sources."""
@@ -38,6 +126,9 @@ class FeatureEngineer:
         """
         Create comprehensive feature set for SKU forecasting.
         Never returns None - returns safe defaults if any step fails.
+        Results are cached for callers outside this app (APIs, kidbea_wh);
+        forecasting itself uses the uncached create_features_for_sku_batch,
+        whose forecasts are cached by PredictionService instead.
 
         Args:
             sku_code: Product SKU code
@@ -50,38 +141,265 @@ class FeatureEngineer:
             Dictionary of features (guaranteed to have safe defaults)
         """
         try:
-            features = {}
+            cache_key = FeatureEngineer._get_features_cache_key(
+                sku_code,
+                forecast_date,
+                include_external,
+                include_weather,
+                include_trends
+            )
+            cached = cache.get(cache_key)
+            if cached:
+                return cached
+
+            shared = FeatureEngineer._load_shared_data([sku_code], forecast_date)
+            features = FeatureEngineer._create_features_with_shared(
+                sku_code,
+                forecast_date,
+                shared,
+                include_external=include_external,
+                include_weather=include_weather,
+                include_trends=include_trends
+            )
 
-            # Basic temporal features
-            features.update(FeatureEngineer._create_temporal_features(forecast_date))
+            # Cache for 15 minutes
+            cache.set(cache_key, features, FEATURES_CACHE_TIMEOUT)
+            return features
 
-            # Seasonal features
-            features.update(FeatureEngineer._create_seasonal_features(sku_code, forecast_date))
+        except Exception as e:
+            logger.error("Error creating features for %s: %s", sku_code, e)
+            # Return safe default features
+            return FeatureEngineer._get_default_features(forecast_date)
 
-            # Festival features
-            if include_external:
-                features.update(FeatureEngineer._create_festival_features(sku_code, forecast_date))
+    @staticmethod
+    def create_features_for_sku_batch(
+        sku_code: str,
+        forecast_dates: List[datetime]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Create the demand-driving features for one SKU over several forecast dates.
+        Variant, festival, weather and sales lookups run once for the whole
+        date range instead of once per date.
+        Never raises - returns neutral defaults if any step fails.
 
-            # Product lifecycle features
-            features.update(FeatureEngineer._create_product_lifecycle_features(sku_code))
+        Args:
+            sku_code: Product SKU code
+            forecast_dates: Dates to create features for
 
-            # Historical sales patterns
-            features.update(FeatureEngineer._create_historical_features(sku_code, forecast_date))
+        Returns:
+            Dictionary mapping feature names to arrays with one value per date
+        """
+        try:
+            variant = FeatureEngineer._get_variants([sku_code]).get(sku_code)
+            festivals = FeatureEngineer._get_upcoming_festivals()
+            weather_map = FeatureEngineer._load_weather_map(min(forecast_dates), max(forecast_dates))
+            lifecycle = FeatureEngineer._create_product_lifecycle_features(sku_code, variant)
+            sales_trends, sales_volatility = FeatureEngineer._calculate_sales_trends_for_dates(
+                sku_code,
+                forecast_dates
+            )
 
-            # Weather features
-            if include_weather:
-                features.update(FeatureEngineer._create_weather_features(forecast_date))
+            seasonal = [
+                FeatureEngineer._create_seasonal_features(sku_code, forecast_date, variant)
+                for forecast_date in forecast_dates
+            ]
+            festival = [
+                FeatureEngineer._create_festival_features(sku_code, forecast_date, festivals)
+                for forecast_date in forecast_dates
+            ]
+            weather = [
+                FeatureEngineer._create_weather_features(
+                    forecast_date,
+                    weather_map,
+                    include_temperature_impact=False
+                )
+                for forecast_date in forecast_dates
+            ]
 
-            # Trends features
-            if include_trends:
-                features.update(FeatureEngineer._create_trends_features(sku_code, forecast_date))
+            # Temperature impact for all dates in one vectorized lookup (dates without a temperature stay 1.0)
+            temperatures = np.array([f['temperature'] or np.nan for f in weather], dtype=float)
+            has_temperature = ~np.isnan(temperatures)
+            temperature_impact = np.ones(len(forecast_dates))
+            temperature_impact[has_temperature] = get_temperature_impact_batch(temperatures[has_temperature])
 
-            return features
+            version = get_static_data_version()
+            return {
+                'seasonal_multiplier': np.array([f['seasonal_multiplier'] for f in seasonal], dtype=float),
+                'festival_multiplier': np.array([f['festival_multiplier'] for f in festival], dtype=float),
+                'day_of_week_multiplier': np.array(
+                    [_day_of_week_multiplier(d.weekday(), version) for d in forecast_dates], dtype=float
+                ),
+                'month_multiplier': np.array([_month_multiplier(d.month, version) for d in forecast_dates], dtype=float),
+                'lifecycle_multiplier': np.full(len(forecast_dates), lifecycle['lifecycle_multiplier'], dtype=float),
+                'temperature_impact': temperature_impact,
+                'weather_impact': np.array([f['weather_impact'] for f in weather], dtype=float),
+                'sales_volatility_7d': sales_volatility,
+                'is_festival_week': np.array([f['is_festival_week'] for f in festival], dtype=bool),
+                'festival_name': np.array([f['festival_name'] for f in festival], dtype=object),
+                'sales_trend_7d': sales_trends
+            }
 
         except Exception as e:
-            logger.error(f"Error creating features for {sku_code}: {str(e)}")
-            # Return safe default features
-            return FeatureEngineer._get_default_features(forecast_date)
+            logger.error("Error creating batch features for %s: %s", sku_code, e)
+            return FeatureEngineer._get_default_feature_batch(len(forecast_dates))
+
+    @staticmethod
+    def _get_default_feature_batch(size: int) -> Dict[str, np.ndarray]:
+        """Get neutral per-date feature arrays when batch feature engineering fails."""
+        return {
+            'seasonal_multiplier': np.ones(size),
+            'festival_multiplier': np.ones(size),
+            'day_of_week_multiplier': np.ones(size),
+            'month_multiplier': np.ones(size),
+            'lifecycle_multiplier': np.ones(size),
+            'temperature_impact': np.ones(size),
+            'weather_impact': np.ones(size),
+            'sales_volatility_7d': np.zeros(size),
+            'is_festival_week': np.zeros(size, dtype=bool),
+            'festival_name': np.full(size, None, dtype=object),
+            'sales_trend_7d': np.full(size, 'stable', dtype=object)
+        }
+
+    @staticmethod
+    def _get_features_cache_key(
+        sku_code: str,
+        forecast_date: datetime,
+        include_external: bool,
+        include_weather: bool,
+        include_trends: bool
+    ) -> str:
+        """Build the versioned cache key for a SKU's feature set."""
+        version = cache.get(FEATURES_CACHE_VERSION_KEY, 1)
+        flags = f"{int(include_external)}{int(include_weather)}{int(include_trends)}"
+        return f"forecasting:features:v{version}:{sku_code}:{forecast_date.date().isoformat()}:{flags}"
+
+    @staticmethod
+    def invalidate_feature_cache():
+        """
+        Invalidate all cached feature sets by bumping the cache key version.
+        Call after ingesting new external or sales data (sales ingest in
+        kidbea_wh reaches this through the invalidate_feature_cache task).
+        """
+        try:
+            cache.incr(FEATURES_CACHE_VERSION_KEY)
+        except ValueError:
+            # Version key missing or evicted: start a new version
+            cache.set(FEATURES_CACHE_VERSION_KEY, 2, None)
+
+    @staticmethod
+    def _load_shared_data(sku_codes: List[str], forecast_date: datetime) -> Dict[str, Any]:
+        """
+        Pre-fetch data shared by the per-SKU feature builders.
+        Issues one query per data source for the whole batch instead of one per SKU.
+        """
+        variants = FeatureEngineer._get_variants(sku_codes)
+        category_names = [
+            category_name
+            for category_name in map(FeatureEngineer._get_category_name, variants.values())
+            if category_name
+        ]
+
+        return {
+            'temporal': FeatureEngineer._create_temporal_features(forecast_date),
+            'variants': variants,
+            'trends_by_category': FeatureEngineer._get_trends_by_category(category_names, forecast_date),
+            'historical': FeatureEngineer._create_historical_features_bulk(sku_codes, forecast_date),
+            'festivals': FeatureEngineer._get_upcoming_festivals(),
+            'weather_map': FeatureEngineer._load_weather_map(forecast_date, forecast_date)
+        }
+
+    @staticmethod
+    def _create_features_with_shared(
+        sku_code: str,
+        forecast_date: datetime,
+        shared: Dict[str, Any],
+        include_external: bool = True,
+        include_weather: bool = True,
+        include_trends: bool = True
+    ) -> Dict[str, Any]:
+        """Create the feature set for a SKU from pre-fetched shared data."""
+        variant = shared['variants'].get(sku_code)
+        features = {}
+
+        # Basic temporal features (same for every SKU in the batch)
+        features.update(shared['temporal'])
+
+        # Seasonal features
+        features.update(FeatureEngineer._create_seasonal_features(sku_code, forecast_date, variant))
+
+        # Festival features
+        if include_external:
+            features.update(
+                FeatureEngineer._create_festival_features(sku_code, forecast_date, shared['festivals'])
+            )
+
+        # Product lifecycle features
+        features.update(FeatureEngineer._create_product_lifecycle_features(sku_code, variant))
+
+        # Historical sales patterns
+        features.update(
+            shared['historical'].get(sku_code) or FeatureEngineer._get_default_historical_features()
+        )
+
+        # Weather features
+        if include_weather:
+            features.update(
+                FeatureEngineer._create_weather_features(forecast_date, shared['weather_map'])
+            )
+
+        # Trends features
+        if include_trends:
+            features.update(
+                FeatureEngineer._create_trends_features(
+                    sku_code,
+                    forecast_date,
+                    variant,
+                    shared['trends_by_category']
+                )
+            )
+
+        return features
+
+    @staticmethod
+    def _get_variants(sku_codes: List[str]) -> Dict[str, Any]:
+        """
+        Fetch product variants for SKUs in a single query, limited to the
+        columns the feature builders read (sku, created_at, category name).
+        Returns an empty mapping on error so feature builders fall back to defaults.
+        """
+        try:
+            variants = ProductVariant.objects.filter(
+                sku__in=sku_codes
+            ).select_related('product__category').only(
+                'sku', 'created_at', 'product__category__name'
+            )
+
+            return {variant.sku: variant for variant in variants}
+
+        except Exception as e:
+            logger.warning("Error fetching variants: %s", e)
+            return {}
+
+    @staticmethod
+    def _get_category_name(variant: Any) -> Optional[str]:
+        """Get the lowercased category name for a variant, or None if unavailable."""
+        try:
+            return variant.product.category.name.lower()
+        except AttributeError:
+            return None
+
+    @staticmethod
+    def _get_upcoming_festivals() -> FestivalIndex:
+        """
+        Get pre-parsed upcoming festivals for today.
+        Returns an empty index on error so festival features fall back to defaults.
+        """
+        try:
+            return _get_parsed_upcoming_festivals(timezone.now().date(), get_static_data_version())
+
+        except Exception as e:
+            logger.warning("Error loading upcoming festivals: %s", e)
+            return EMPTY_FESTIVAL_INDEX
 
     @staticmethod
     def _get_default_features(forecast_date: datetime) -> Dict[str, Any]:
@@ -138,6 +456,7 @@ class FeatureEngineer:
     @staticmethod
     def _create_temporal_features(forecast_date: datetime) -> Dict[str, Any]:
         """Create temporal/calendar features."""
+        version = get_static_data_version()
         return {
             'day_of_week': forecast_date.weekday(),
             'day_of_month': forecast_date.day,
@@ -148,40 +467,28 @@ class FeatureEngineer:
             'is_month_end': 1 if forecast_date.day >= 25 else 0,
             'is_month_start': 1 if forecast_date.day <= 5 else 0,
             'is_quarter_end': 1 if forecast_date.day >= 25 and forecast_date.month % 3 == 0 else 0,
-            'day_of_week_multiplier': get_day_of_week_multiplier(forecast_date.weekday()),
-            'month_multiplier': get_month_multiplier(forecast_date.month)
+            'day_of_week_multiplier': _day_of_week_multiplier(forecast_date.weekday(), version),
+            'month_multiplier': _month_multiplier(forecast_date.month, version)
         }
 
     @staticmethod
-    def _create_seasonal_features(sku_code: str, forecast_date: datetime) -> Dict[str, Any]:
+    def _create_seasonal_features(
+        sku_code: str,
+        forecast_date: datetime,
+        variant: Optional[Any]
+    ) -> Dict[str, Any]:
         """Create seasonal features."""
         try:
-            from variant.models import ProductVariant
-            from category.models import Category
-
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
             if not variant:
                 return {'seasonal_multiplier': 1.0, 'season': 'unknown'}
 
             # Get category seasonal multiplier
-            category = variant.product.category if hasattr(variant.product, 'category') else None
-            category_name = category.name if category else 'default'
+            category_name = FeatureEngineer._get_category_name(variant) or 'default'
 
-            seasonal_multiplier = get_seasonal_multiplier(
-                category_name.lower(),
-                forecast_date.month
-            )
+            seasonal_multiplier = _seasonal_multiplier(category_name, forecast_date.month, get_static_data_version())
 
             # Determine season
-            month = forecast_date.month
-            if month in [11, 12, 1, 2]:
-                season = 'winter'
-            elif month in [3, 4, 5, 6]:
-                season = 'summer'
-            elif month in [7, 8, 9]:
-                season = 'monsoon'
-            else:
-                season = 'spring'
+            season = MONTH_TO_SEASON[forecast_date.month - 1]
 
             return {
                 'seasonal_multiplier': seasonal_multiplier,
@@ -190,12 +497,16 @@ class FeatureEngineer:
             }
 
         except Exception as e:
-            logger.warning(f"Error creating seasonal features for {sku_code}: {str(e)}")
+            logger.warning("Error creating seasonal features for %s: %s", sku_code, e)
             return {'seasonal_multiplier': 1.0, 'season': 'unknown'}
 
     @staticmethod
-    def _create_festival_features(sku_code: str, forecast_date: datetime) -> Dict[str, Any]:
-        """Create festival-related features."""
+    def _create_festival_features(
+        sku_code: str,
+        forecast_date: datetime,
+        festivals: Optional[FestivalIndex] = None
+    ) -> Dict[str, Any]:
+        """Create festival-related features from pre-parsed upcoming festivals."""
         try:
             features = {
                 'is_festival_week': 0,
@@ -206,32 +517,38 @@ class FeatureEngineer:
             }
 
             # Get upcoming festivals
-            upcoming_festivals = get_upcoming_festivals(days_ahead=60)
+            if festivals is None:
+                festivals = _get_parsed_upcoming_festivals(timezone.now().date(), get_static_data_version())
+
+            # Only festivals within the widest impact window of forecast_date can match
+            target = forecast_date.date()
+            window = timedelta(days=festivals.max_window)
+            start = bisect_left(festivals.dates, target - window)
+            end = bisect_right(festivals.dates, target + window)
 
-            # Check if forecast_date is near any festival
-            for festival in upcoming_festivals:
-                festival_date = datetime.strptime(
-                    festival['festival_date'],
-                    '%Y-%m-%d'
-                ).date()
-                days_diff = (festival_date - forecast_date.date()).days
+            for festival in festivals.festivals[start:end]:
+                days_diff = (festival['date'] - target).days
 
                 # Check if within impact window
-                impact_window = festival.get('impact_window_days', 7)
+                impact_window = festival['window']
                 if -impact_window <= days_diff <= impact_window:
                     features['is_festival_week'] = 1
                     features['festival_name'] = festival['name']
-                    features['festival_multiplier'] = festival.get('demand_multiplier', 1.0)
+                    features['festival_multiplier'] = festival['mult']
                     features['days_to_festival'] = days_diff
                     features['festival_impact_window'] = impact_window
-                    break
-                elif 0 < days_diff < features['days_to_festival']:
-                    features['days_to_festival'] = days_diff
+                    return features
+
+            # Not in any impact window: distance to the next festival
+            next_index = bisect_right(festivals.dates, target)
+            if next_index < len(festivals.dates):
+                days_diff = (festivals.dates[next_index] - target).days
+                features['days_to_festival'] = min(days_diff, features['days_to_festival'])
 
             return features
 
         except Exception as e:
-            logger.warning(f"Error creating festival features: {str(e)}")
+            logger.warning("Error creating festival features: %s", e)
             return {
                 'is_festival_week': 0,
                 'festival_name': None,
@@ -241,12 +558,9 @@ class FeatureEngineer:
             }
 
     @staticmethod
-    def _create_product_lifecycle_features(sku_code: str) -> Dict[str, Any]:
+    def _create_product_lifecycle_features(sku_code: str, variant: Optional[Any]) -> Dict[str, Any]:
         """Create product lifecycle features based on created_at."""
         try:
-            from variant.models import ProductVariant
-
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
             if not variant or not variant.created_at:
                 return {
                     'days_since_launch': 999,
@@ -274,100 +588,118 @@ class FeatureEngineer:
             }
 
         except Exception as e:
-            logger.warning(f"Error creating product lifecycle features for {sku_code}: {str(e)}")
+            logger.warning("Error creating product lifecycle features for %s: %s", sku_code, e)
             return {
                 'days_since_launch': 999,
                 'lifecycle_stage': 'unknown',
                 'lifecycle_multiplier': 1.0
             }
 
+    @staticmethod
+    def _get_default_historical_features() -> Dict[str, Any]:
+        """Get default historical features when sales data is unavailable."""
+        return {
+            'avg_daily_sales_7d': 0,
+            'avg_daily_sales_30d': 0,
+            'avg_daily_sales_90d': 0,
+            'sales_trend_7d': 'stable',
+            'sales_volatility_7d': 0,
+            'days_since_last_sale': 999,
+            'stockout_occurred': 0
+        }
+
     @staticmethod
     def _create_historical_features(sku_code: str, forecast_date: datetime) -> Dict[str, Any]:
         """Create features from historical sales data."""
-        try:
-            from forecasting.models import HistoricalSalesDaily
-
-            features = {
-                'avg_daily_sales_7d': 0,
-                'avg_daily_sales_30d': 0,
-                'avg_daily_sales_90d': 0,
-                'sales_trend_7d': 'stable',
-                'sales_volatility_7d': 0,
-                'days_since_last_sale': 999,
-                'stockout_occurred': 0
-            }
+        historical = FeatureEngineer._create_historical_features_bulk([sku_code], forecast_date)
+        return historical.get(sku_code, FeatureEngineer._get_default_historical_features())
 
+    @staticmethod
+    def _create_historical_features_bulk(
+        sku_codes: List[str],
+        forecast_date: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Create historical sales features for multiple SKUs.
+        Window averages come from a single conditional-aggregation GROUP BY;
+        the 7-day daily values are loaded into a (SKU x day) matrix for the
+        NumPy trend and volatility calculation.
+        """
+        try:
             # Historical sales data
-            end_date = forecast_date - timedelta(days=1)
+            end_date = (forecast_date - timedelta(days=1)).date()
             start_7d = end_date - timedelta(days=6)
             start_30d = end_date - timedelta(days=29)
             start_90d = end_date - timedelta(days=89)
 
-            sales_7d = HistoricalSalesDaily.objects.filter(
-                sku_code=sku_code,
+            sku_codes = list(dict.fromkeys(sku_codes))
+
+            # Window averages in one GROUP BY using conditional aggregation
+            averages = {
+                row['sku_code']: row
+                for row in HistoricalSalesDaily.objects.filter(
+                    sku_code__in=sku_codes,
+                    sale_date__range=[start_90d, end_date]
+                ).values('sku_code').order_by().annotate(
+                    avg_7d=Avg('quantity_sold', filter=Q(sale_date__gte=start_7d)),
+                    avg_30d=Avg('quantity_sold', filter=Q(sale_date__gte=start_30d)),
+                    avg_90d=Avg('quantity_sold')
+                )
+            }
+
+            # Daily values for the 7-day window: one row per SKU, one column per day (NaN = no sales row)
+            rows = HistoricalSalesDaily.objects.filter(
+                sku_code__in=sku_codes,
                 sale_date__range=[start_7d, end_date]
-            )
-            sales_30d = HistoricalSalesDaily.objects.filter(
-                sku_code=sku_code,
-                sale_date__range=[start_30d, end_date]
-            )
-            sales_90d = HistoricalSalesDaily.objects.filter(
-                sku_code=sku_code,
-                sale_date__range=[start_90d, end_date]
+            ).values_list('sku_code', 'sale_date', 'quantity_sold').iterator(chunk_size=HISTORICAL_ROWS_CHUNK_SIZE)
+
+            sku_index = {sku_code: i for i, sku_code in enumerate(sku_codes)}
+            sales_7d = np.full((len(sku_codes), 7), np.nan)
+            for sku_code, sale_date, quantity_sold in rows:
+                sales_7d[sku_index[sku_code], (sale_date - start_7d).days] = quantity_sold
+
+            trends, volatility = FeatureEngineer._calculate_trend_matrix(sales_7d)
+
+            # Days since last sale within the 7-day window
+            has_sale_7d = ~np.isnan(sales_7d)
+            days_since_last_sale = np.where(
+                has_sale_7d.any(axis=1),
+                np.argmax(has_sale_7d[:, ::-1], axis=1),
+                999
             )
 
-            # Calculate averages
-            if sales_7d.exists():
-                avg_7d = sales_7d.aggregate(Avg('quantity_sold'))['quantity_sold__avg'] or 0
-                features['avg_daily_sales_7d'] = avg_7d
-
-            if sales_30d.exists():
-                avg_30d = sales_30d.aggregate(Avg('quantity_sold'))['quantity_sold__avg'] or 0
-                features['avg_daily_sales_30d'] = avg_30d
-
-            if sales_90d.exists():
-                avg_90d = sales_90d.aggregate(Avg('quantity_sold'))['quantity_sold__avg'] or 0
-                features['avg_daily_sales_90d'] = avg_90d
-
-            # Trend detection
-            if sales_7d.count() >= 2:
-                values = list(sales_7d.order_by('sale_date').values_list('quantity_sold', flat=True))
-                features['sales_trend_7d'] = FeatureEngineer._calculate_trend(values)
-
-                # Volatility
-                if len(values) > 1:
-                    import statistics
-                    try:
-                        features['sales_volatility_7d'] = statistics.stdev(values)
-                    except:
-                        features['sales_volatility_7d'] = 0
-
-            # Days since last sale
-            last_sale = sales_7d.order_by('-sale_date').first()
-            if last_sale:
-                days_diff = (end_date.date() - last_sale.sale_date).days
-                features['days_since_last_sale'] = max(days_diff, 0)
+            historical = {}
+            for i, sku_code in enumerate(sku_codes):
+                features = FeatureEngineer._get_default_historical_features()
+                sku_averages = averages.get(sku_code, {})
+                features['avg_daily_sales_7d'] = float(sku_averages.get('avg_7d') or 0)
+                features['avg_daily_sales_30d'] = float(sku_averages.get('avg_30d') or 0)
+                features['avg_daily_sales_90d'] = float(sku_averages.get('avg_90d') or 0)
+                features['sales_trend_7d'] = str(trends[i])
+                features['sales_volatility_7d'] = float(volatility[i])
+                features['days_since_last_sale'] = int(days_since_last_sale[i])
+                historical[sku_code] = features
 
-            return features
+            return historical
 
         except Exception as e:
-            logger.warning(f"Error creating historical features for {sku_code}: {str(e)}")
+            logger.warning("Error creating historical features: %s", e)
             return {
-                'avg_daily_sales_7d': 0,
-                'avg_daily_sales_30d': 0,
-                'avg_daily_sales_90d': 0,
-                'sales_trend_7d': 'stable',
-                'sales_volatility_7d': 0,
-                'days_since_last_sale': 999,
-                'stockout_occurred': 0
+                sku_code: FeatureEngineer._get_default_historical_features()
+                for sku_code in sku_codes
             }
 
     @staticmethod
-    def _create_weather_features(forecast_date: datetime) -> Dict[str, Any]:
-        """Create weather-related features."""
+    def _create_weather_features(
+        forecast_date: datetime,
+        weather_map: Optional[Dict[date, Any]] = None,
+        include_temperature_impact: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Create weather-related features.
+        Batch callers pass include_temperature_impact=False and compute it for all dates at once.
+        """
         try:
-            from forecasting.models import ExternalDataSource
-
             features = {
                 'temperature': None,
                 'humidity': None,
@@ -379,13 +711,11 @@ class FeatureEngineer:
             }
 
             # Get weather data for forecast date
-            weather_data = ExternalDataSource.objects.filter(
-                data_type='weather',
-                data_date=forecast_date.date()
-            ).first()
+            if weather_map is None:
+                weather_map = FeatureEngineer._load_weather_map(forecast_date, forecast_date)
 
-            if weather_data and weather_data.raw_data:
-                raw = weather_data.raw_data
+            raw = weather_map.get(forecast_date.date())
+            if raw:
                 if isinstance(raw, dict):
                     features['temperature'] = raw.get('temperature')
                     features['humidity'] = raw.get('humidity')
@@ -394,7 +724,7 @@ class FeatureEngineer:
                     features['has_weather_data'] = True
 
                     # Calculate impacts
-                    if features['temperature']:
+                    if include_temperature_impact and features['temperature']:
                         features['temperature_impact'] = get_temperature_impact(
                             features['temperature']
                         )
@@ -407,7 +737,7 @@ class FeatureEngineer:
             return features
 
         except Exception as e:
-            logger.warning(f"Error creating weather features: {str(e)}")
+            logger.warning("Error creating weather features: %s", e)
             return {
                 'temperature': None,
                 'humidity': None,
@@ -419,12 +749,37 @@ class FeatureEngineer:
             }
 
     @staticmethod
-    def _create_trends_features(sku_code: str, forecast_date: datetime) -> Dict[str, Any]:
-        """Create Google Trends features."""
+    def _load_weather_map(start_date: datetime, end_date: datetime) -> Dict[date, Any]:
+        """
+        Fetch weather data for a date range in one query, keyed by date.
+        Keeps the earliest-stored row (lowest pk) per date when several locations
+        report the same day, so the choice is stable between queries.
+        """
         try:
-            from forecasting.models import ExternalDataSource
-            from variant.models import ProductVariant
+            rows = ExternalDataSource.objects.filter(
+                data_type='weather',
+                data_date__range=[start_date.date(), end_date.date()]
+            ).order_by('data_date', 'pk').values_list('data_date', 'raw_data')
 
+            weather_map = {}
+            for data_date, raw_data in rows:
+                weather_map.setdefault(data_date, raw_data)
+
+            return weather_map
+
+        except Exception as e:
+            logger.warning("Error fetching weather data: %s", e)
+            return {}
+
+    @staticmethod
+    def _create_trends_features(
+        sku_code: str,
+        forecast_date: datetime,
+        variant: Optional[Any],
+        trends_by_category: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Create Google Trends features."""
+        try:
             features = {
                 'trend_score': 50,
                 'trend_direction': 'stable',
@@ -432,36 +787,29 @@ class FeatureEngineer:
             }
 
             # Get product category
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
             if not variant:
                 return features
 
             # Look for trends data for this category
-            category_name = None
-            try:
-                if hasattr(variant, 'product') and hasattr(variant.product, 'category'):
-                    category_name = variant.product.category.name
-            except:
-                pass
+            category_name = FeatureEngineer._get_category_name(variant)
 
             if category_name:
-                trends_data = ExternalDataSource.objects.filter(
-                    data_type='trends',
-                    raw_data__contains=category_name,
-                    data_date__lte=forecast_date.date()
-                ).order_by('-data_date').first()
-
-                if trends_data and trends_data.raw_data:
-                    raw = trends_data.raw_data
-                    if isinstance(raw, dict):
-                        features['trend_score'] = raw.get('score', 50)
-                        features['trend_direction'] = raw.get('direction', 'stable')
-                        features['has_trend_data'] = True
+                if trends_by_category is None:
+                    trends_by_category = FeatureEngineer._get_trends_by_category(
+                        [category_name],
+                        forecast_date
+                    )
+
+                raw = trends_by_category.get(category_name)
+                if raw and isinstance(raw, dict):
+                    features['trend_score'] = raw.get('score', 50)
+                    features['trend_direction'] = raw.get('direction', 'stable')
+                    features['has_trend_data'] = True
 
             return features
 
         except Exception as e:
-            logger.warning(f"Error creating trends features: {str(e)}")
+            logger.warning("Error creating trends features: %s", e)
             return {
                 'trend_score': 50,
                 'trend_direction': 'stable',
@@ -469,29 +817,104 @@ class FeatureEngineer:
             }
 
     @staticmethod
-    def _calculate_trend(values: List[float]) -> str:
-        """Calculate trend direction."""
-        if len(values) < 2:
-            return 'stable'
+    def _get_trends_by_category(category_names: List[str], forecast_date: datetime) -> Dict[str, Any]:
+        """
+        Fetch the latest trends data on or before forecast_date for each category.
+        Trends rows are keyed by category in product_code, so this is a single
+        DISTINCT ON lookup instead of a JSON scan per SKU.
+        """
+        try:
+            if not category_names:
+                return {}
+
+            rows = ExternalDataSource.objects.filter(
+                data_type='trends',
+                product_code__in=set(category_names),
+                data_date__lte=forecast_date.date()
+            ).order_by('product_code', '-data_date').distinct('product_code').values_list(
+                'product_code', 'raw_data'
+            )
+
+            return dict(rows)
+
+        except Exception as e:
+            logger.warning("Error fetching trends data: %s", e)
+            return {}
+
+    @staticmethod
+    def _calculate_sales_trends_for_dates(
+        sku_code: str,
+        forecast_dates: List[datetime]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        7-day sales trend and volatility preceding each forecast date.
+        Loads the covering date range in one query and slices a 7-day
+        window per date into a (date x day) matrix.
+        """
+        first_day = (min(forecast_dates) - timedelta(days=7)).date()
+        last_day = (max(forecast_dates) - timedelta(days=1)).date()
 
-        mid = len(values) // 2
-        if mid == 0:
-            return 'stable'
+        daily_sales = np.full((last_day - first_day).days + 1, np.nan)
+        rows = HistoricalSalesDaily.objects.filter(
+            sku_code=sku_code,
+            sale_date__range=[first_day, last_day]
+        ).values_list('sale_date', 'quantity_sold')
+        for sale_date, quantity_sold in rows:
+            daily_sales[(sale_date - first_day).days] = quantity_sold
 
-        first_half = sum(values[:mid]) / len(values[:mid])
-        second_half = sum(values[mid:]) / len(values[mid:])
+        window_starts = np.array([(d.date() - first_day).days - 7 for d in forecast_dates])
+        windows = daily_sales[window_starts[:, None] + np.arange(7)]
 
-        if first_half == 0:
-            return 'stable'
+        return FeatureEngineer._calculate_trend_matrix(windows)
 
-        change_pct = ((second_half - first_half) / first_half) * 100
+    @staticmethod
+    def _masked_mean_rows(matrix: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Row-wise mean of the masked entries; rows without any yield 0."""
+        counts = np.count_nonzero(mask, axis=1)
+        sums = np.sum(matrix, axis=1, where=mask)
+        return np.divide(sums, counts, out=np.zeros(len(matrix)), where=counts > 0)
 
-        if change_pct > 10:
-            return 'increasing'
-        elif change_pct < -10:
-            return 'decreasing'
-        else:
-            return 'stable'
+    @staticmethod
+    def _calculate_trend_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized trend direction and volatility for a (SKU x day) matrix.
+        NaN marks days without a sales row. As in _calculate_trend, each row's
+        present values (in date order) are split into halves at count // 2,
+        so gaps don't shift the split. Rows with fewer than 2 sales values
+        are 'stable' with zero volatility.
+        """
+        present = ~np.isnan(matrix)
+        counts = np.count_nonzero(present, axis=1)
+
+        # Position of each present value among its row's present values
+        ranks = np.cumsum(present, axis=1) - 1
+        in_first_half = present & (ranks < (counts // 2)[:, None])
+        in_second_half = present & ~in_first_half
+
+        first_half = FeatureEngineer._masked_mean_rows(matrix, in_first_half)
+        second_half = FeatureEngineer._masked_mean_rows(matrix, in_second_half)
+        change_pct = np.divide(
+            (second_half - first_half) * 100,
+            first_half,
+            out=np.zeros(len(matrix)),
+            where=first_half > 0
+        )
+
+        enough_data = counts >= 2
+        trends = np.select(
+            [enough_data & (change_pct > 10), enough_data & (change_pct < -10)],
+            ['increasing', 'decreasing'],
+            default='stable'
+        )
+
+        # Sample standard deviation (ddof=1), reusing the per-row counts
+        means = np.divide(np.nansum(matrix, axis=1), counts, out=np.zeros(len(matrix)), where=counts > 0)
+        squared_dev = np.nansum((matrix - means[:, None]) ** 2, axis=1)
+        volatility = np.sqrt(
+            np.divide(squared_dev, counts - 1, out=np.zeros(len(matrix)), where=enough_data)
+        )
+
+        return trends, volatility
 
     @staticmethod
     def create_bulk_features(
@@ -512,17 +935,20 @@ class FeatureEngineer:
             Dictionary mapping SKU codes to features (guaranteed valid)
         """
         features_dict = {}
+        shared = FeatureEngineer._load_shared_data(sku_codes, forecast_date)
 
+        # Per-SKU builds are CPU-bound Python/NumPy on the prefetched data, so they run serially
         for sku_code in sku_codes:
             try:
-                features = FeatureEngineer.create_features_for_sku(
+                features = FeatureEngineer._create_features_with_shared(
                     sku_code,
                     forecast_date,
+                    shared,
                     **kwargs
                 )
                 features_dict[sku_code] = features if features else FeatureEngineer._get_default_features(forecast_date)
             except Exception as e:
-                logger.error(f"Error creating features for {sku_code}: {str(e)}")
+                logger.error("Error creating features for %s: %s", sku_code, e)
                 features_dict[sku_code] = FeatureEngineer._get_default_features(forecast_date)
 
         return features_dict
@@ -4,11 +4,17 @@ Coordinates external data, feature engineering, and forecast generation.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from decimal import Decimal
+from django.conf import settings
+from django.db import connection
 from django.utils import timezone
-from django.db.models import Avg, Sum, Max, Min, Q
+from django.db.models import Avg, Count, F, Sum, Max, Min, Q
+from django.db.models.functions import ExtractMonth
 from django.core.cache import cache
 
 from forecasting.models import (
@@ -18,9 +24,114 @@ from forecasting.models import (
 from variant.models import ProductVariant
 from category.models import Category
 from forecasting.services.feature_engineering import FeatureEngineer
+from forecasting.utils.data_loaders import MONTH_TO_SEASON
 
 logger = logging.getLogger(__name__)
 
+# Forecasts are served as-is for an hour, then served stale for up to
+# 6 hours while a background task recomputes them
+FORECAST_FRESH_TIMEOUT = 3600
+FORECAST_CACHE_TIMEOUT = 21600
+FORECAST_REFRESH_LOCK_TIMEOUT = 60
+
+# Reason attached to the placeholder forecast returned when generation fails;
+# placeholders are never cached
+FORECAST_ERROR_REASON = 'Error in forecast generation'
+
+# get_quick_forecast results
+QUICK_FORECAST_CACHE_TIMEOUT = 3600
+
+# Feature multipliers applied to the baseline demand, in application order
+FORECAST_MULTIPLIER_FEATURES = (
+    'seasonal_multiplier',
+    'festival_multiplier',
+    'day_of_week_multiplier',
+    'month_multiplier',
+    'lifecycle_multiplier',
+    'temperature_impact',
+    'weather_impact'
+)
+
+
+class ForecastFeatures(NamedTuple):
+    """
+    Per-date forecast inputs normalized once from a feature batch.
+    Missing or non-positive multipliers are already replaced with 1.0.
+    """
+    multipliers: np.ndarray
+    is_festival_week: List[bool]
+    festival_name: List[Optional[str]]
+    sales_trend_7d: List[str]
+    temperature_impact: List[float]
+
+    @classmethod
+    def from_batch(cls, features: Dict[str, np.ndarray], size: int) -> 'ForecastFeatures':
+        """Validate a feature batch and broadcast every feature to one value per date."""
+        def column(name: str, default: Any, dtype: Any) -> np.ndarray:
+            return np.broadcast_to(np.asarray(features.get(name, default), dtype=dtype), (size,))
+
+        multipliers = np.array(
+            [column(name, 1.0, np.float64) for name in FORECAST_MULTIPLIER_FEATURES]
+        ).reshape(len(FORECAST_MULTIPLIER_FEATURES), size)
+
+        return cls(
+            multipliers=np.where(multipliers > 0, multipliers, 1.0),
+            is_festival_week=column('is_festival_week', False, bool).tolist(),
+            festival_name=column('festival_name', None, object).tolist(),
+            sales_trend_7d=column('sales_trend_7d', 'stable', object).tolist(),
+            temperature_impact=column('temperature_impact', 1.0, np.float64).tolist()
+        )
+
+
+class ForecastBundle(NamedTuple):
+    """
+    Daily forecasts for one SKU as parallel arrays, one entry per date.
+    Serialized to the list-of-dicts API format with to_dicts().
+    """
+    dates: List[str]
+    predicted_quantity: np.ndarray
+    confidence_lower: np.ndarray
+    confidence_upper: np.ndarray
+    influencing_factors: List[List[str]]
+    model_type: str
+
+    @classmethod
+    def constant(
+        cls,
+        dates: List[str],
+        model_type: str,
+        influencing_factor: str
+    ) -> 'ForecastBundle':
+        """Default forecast of 10 units (5-15) per day."""
+        return cls(
+            dates=dates,
+            predicted_quantity=np.full(len(dates), 10, dtype=np.int64),
+            confidence_lower=np.full(len(dates), 5, dtype=np.int64),
+            confidence_upper=np.full(len(dates), 15, dtype=np.int64),
+            influencing_factors=[[influencing_factor] for _ in dates],
+            model_type=model_type
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to the list of daily forecast dicts returned by the API."""
+        return [
+            {
+                'date': forecast_date,
+                'predicted_quantity': quantity,
+                'confidence_lower': lower,
+                'confidence_upper': upper,
+                'model_type': self.model_type,
+                'influencing_factors': factors
+            }
+            for forecast_date, quantity, lower, upper, factors in zip(
+                self.dates,
+                self.predicted_quantity.tolist(),
+                self.confidence_lower.tolist(),
+                self.confidence_upper.tolist(),
+                self.influencing_factors
+            )
+        ]
+
 
 class PredictionService:
     """Main service for generating demand forecasts."""
@@ -30,7 +141,10 @@ class PredictionService:
         sku_code: str,
         days_ahead: int = 7,
         model_type: Optional[str] = None,
-        include_confidence: bool = True
+        include_confidence: bool = True,
+        baseline_map: Optional[Dict[str, float]] = None,
+        stock_map: Optional[Dict[str, int]] = None,
+        use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Get demand forecast for a specific SKU.
@@ -40,18 +154,29 @@ class PredictionService:
             days_ahead: Number of days to forecast
             model_type: Specific model type to use (default: ensemble)
             include_confidence: Include confidence intervals
+            baseline_map: Pre-fetched baseline demand by SKU (skips the per-SKU query)
+            stock_map: Pre-fetched current stock by SKU (skips the per-SKU query)
+            use_cache: Read and write the forecast cache (bulk callers batch this themselves)
 
         Returns:
             Dictionary with forecast data
         """
-        cache_key = f"forecast:demand:{sku_code}:{days_ahead}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+        cache_key = PredictionService._forecast_cache_key(sku_code, days_ahead)
+        if use_cache:
+            cached = PredictionService._read_forecast_cache_entry(
+                cache_key,
+                cache.get(cache_key),
+                sku_code,
+                days_ahead
+            )
+            if cached:
+                return cached
 
         try:
             # Try to get variant, but continue with defaults if not found
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
+            variant = ProductVariant.objects.select_related('product').only(
+                'sku', 'product__name'
+            ).filter(sku=sku_code).first()
             product_name = 'Unknown'
             if variant:
                 product_name = getattr(variant.product, 'name', 'Unknown') if hasattr(variant, 'product') else 'Unknown'
@@ -61,55 +186,59 @@ class PredictionService:
                 active_model = ModelVersion.objects.filter(is_active=True).first()
                 model_type = active_model.model_type if active_model else 'moving_average'
 
-            # Generate forecasts
-            forecasts = []
-            today = timezone.now()
-
-            for day_offset in range(1, days_ahead + 1):
-                forecast_date = today + timedelta(days=day_offset)
+            # Historical baseline is the same for every forecast day
+            if baseline_map is not None:
+                baseline_demand = baseline_map.get(sku_code, 10.0)
+            else:
+                baseline_demand = PredictionService._get_baseline_demand(sku_code)
 
-                # Create features with graceful fallbacks
-                try:
-                    features = FeatureEngineer.create_features_for_sku(sku_code, forecast_date)
-                except Exception as feature_error:
-                    logger.warning(f"Feature engineering error for {sku_code}: {feature_error}, using defaults")
-                    features = PredictionService._get_default_features()
+            # Generate forecasts for all days at once
+            today = timezone.now()
+            forecast_dates = [today + timedelta(days=day_offset) for day_offset in range(1, days_ahead + 1)]
 
-                # Generate prediction - guaranteed to return a dict
-                prediction = PredictionService._generate_single_forecast(
-                    sku_code,
-                    forecast_date,
-                    features,
-                    model_type,
-                    include_confidence
+            # Create features with graceful fallbacks
+            try:
+                features = ForecastFeatures.from_batch(
+                    FeatureEngineer.create_features_for_sku_batch(sku_code, forecast_dates),
+                    len(forecast_dates)
                 )
-
-                if prediction:
-                    forecasts.append(prediction)
+            except Exception as feature_error:
+                logger.warning(f"Feature engineering error for {sku_code}: {feature_error}, using defaults")
+                features = ForecastFeatures.from_batch({}, len(forecast_dates))
+
+            bundle = PredictionService._generate_forecast_bundle(
+                forecast_dates,
+                features,
+                model_type,
+                include_confidence,
+                baseline_demand
+            )
 
             # If no forecasts generated, create at least one default
-            if not forecasts:
+            if not bundle.dates:
                 logger.warning(f"No forecasts generated for {sku_code}, creating default")
-                for day_offset in range(1, min(days_ahead + 1, 8)):
-                    forecast_date = today + timedelta(days=day_offset)
-                    forecasts.append({
-                        'date': forecast_date.date().isoformat(),
-                        'predicted_quantity': 10,
-                        'confidence_lower': 5,
-                        'confidence_upper': 15,
-                        'model_type': model_type,
-                        'influencing_factors': ['Using default forecast - insufficient data']
-                    })
+                bundle = ForecastBundle.constant(
+                    [
+                        (today + timedelta(days=day_offset)).date().isoformat()
+                        for day_offset in range(1, min(days_ahead + 1, 8))
+                    ],
+                    model_type,
+                    'Using default forecast - insufficient data'
+                )
 
             # Get current stock and reorder info
-            current_stock = PredictionService._get_current_stock(sku_code)
+            if stock_map is not None:
+                current_stock = stock_map.get(sku_code, 0)
+            else:
+                current_stock = PredictionService._get_current_stock(sku_code)
             days_until_stockout = PredictionService._calculate_days_to_stockout(
                 sku_code,
-                forecasts
+                bundle.predicted_quantity,
+                current_stock=current_stock
             )
             recommended_reorder = PredictionService._calculate_reorder_quantity(
                 sku_code,
-                forecasts
+                bundle.predicted_quantity
             )
 
             result = {
@@ -117,7 +246,7 @@ class PredictionService:
                 'product_name': product_name,
                 'forecast_start_date': (today + timedelta(days=1)).date().isoformat(),
                 'forecast_end_date': (today + timedelta(days=days_ahead)).date().isoformat(),
-                'forecasts': forecasts,
+                'forecasts': bundle.to_dicts(),
                 'current_stock': current_stock,
                 'days_until_stockout': days_until_stockout,
                 'recommended_reorder': recommended_reorder,
@@ -126,7 +255,12 @@ class PredictionService:
             }
 
             # Cache for 6 hours
-            cache.set(cache_key, result, 21600)
+            if use_cache:
+                cache.set(
+                    cache_key,
+                    PredictionService._make_forecast_cache_entry(result),
+                    FORECAST_CACHE_TIMEOUT
+                )
             return result
 
         except Exception as e:
@@ -145,7 +279,7 @@ class PredictionService:
                         'confidence_lower': 5,
                         'confidence_upper': 15,
                         'model_type': model_type or 'moving_average',
-                        'influencing_factors': ['Error in forecast generation']
+                        'influencing_factors': [FORECAST_ERROR_REASON]
                     }
                     for i in range(1, min(days_ahead + 1, 8))
                 ],
@@ -157,76 +291,262 @@ class PredictionService:
             }
 
     @staticmethod
-    def _generate_single_forecast(
-        sku_code: str,
-        forecast_date: datetime,
-        features: Dict[str, Any],
-        model_type: str,
-        include_confidence: bool
-    ) -> Optional[Dict[str, Any]]:
-        """Generate a single day forecast. Never returns None - always returns valid data."""
-        try:
-            # Get historical baseline
-            baseline_demand = PredictionService._get_baseline_demand(sku_code)
-
-            # Apply multipliers - ensure all are present with safe defaults
-            multipliers = [
-                float(features.get('seasonal_multiplier', 1.0)),
-                float(features.get('festival_multiplier', 1.0)),
-                float(features.get('day_of_week_multiplier', 1.0)),
-                float(features.get('month_multiplier', 1.0)),
-                float(features.get('lifecycle_multiplier', 1.0)),
-                float(features.get('temperature_impact', 1.0)),
-                float(features.get('weather_impact', 1.0))
-            ]
+    def get_demand_forecast_bulk(
+        sku_codes: Iterable[str],
+        days_ahead: int = 7
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get demand forecasts for many SKUs at once.
 
-            combined_multiplier = 1.0
-            for mult in multipliers:
-                if mult and mult > 0:
-                    combined_multiplier *= mult
-
-            predicted_quantity = max(int(baseline_demand * combined_multiplier), 1)
-
-            # Calculate confidence intervals
-            confidence_lower = predicted_quantity
-            confidence_upper = predicted_quantity
-
-            if include_confidence:
-                # Use historical volatility for confidence intervals
-                volatility = features.get('sales_volatility_7d', 0)
-                confidence_range = max(int(predicted_quantity * 0.2), 5)  # 20% or min 5
-                confidence_lower = max(predicted_quantity - confidence_range, 0)
-                confidence_upper = predicted_quantity + confidence_range
-
-            # Influencing factors for transparency
-            influencing_factors = []
-            if features.get('is_festival_week'):
-                influencing_factors.append(f"Festival: {features.get('festival_name', 'Unknown')}")
-            if features.get('sales_trend_7d') == 'increasing':
-                influencing_factors.append('Increasing trend')
-            if features.get('temperature_impact', 1.0) != 1.0:
-                influencing_factors.append('Weather impact')
+        Args:
+            sku_codes: Product SKU codes
+            days_ahead: Number of days to forecast
 
+        Returns:
+            Dictionary mapping SKU code to forecast data (SKUs without a forecast are omitted).
+            Each forecast also carries 'predicted_qty_array', the daily predicted quantities
+            as a numpy array, so callers can aggregate without walking the dict list.
+        """
+        try:
+            sku_codes = list(dict.fromkeys(sku_codes))
+            if not sku_codes:
+                return {}
+            forecasts = PredictionService._get_demand_forecasts_bulk(sku_codes, days_ahead)
             return {
-                'date': forecast_date.date().isoformat(),
-                'predicted_quantity': predicted_quantity,
-                'confidence_lower': confidence_lower,
-                'confidence_upper': confidence_upper,
-                'model_type': model_type,
-                'influencing_factors': influencing_factors
+                sku_code: {
+                    **forecast,
+                    'predicted_qty_array': np.fromiter(
+                        (f['predicted_quantity'] for f in forecast['forecasts']),
+                        dtype=float,
+                        count=len(forecast['forecasts'])
+                    )
+                }
+                for sku_code, forecast in forecasts.items() if forecast
             }
 
         except Exception as e:
-            logger.error(f"Error in single forecast for {sku_code} on {forecast_date}: {str(e)}")
-            # Return safe default instead of None
-            return {
-                'date': forecast_date.date().isoformat(),
-                'predicted_quantity': 10,
-                'confidence_lower': 5,
-                'confidence_upper': 15,
-                'model_type': model_type,
-                'influencing_factors': ['Default forecast due to error']
-            }
+            logger.error(f"Error getting bulk demand forecasts: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _forecast_cache_key(sku_code: str, days_ahead: int) -> str:
+        """Cache key for a SKU's demand forecast."""
+        return f"forecast:demand:{sku_code}:{days_ahead}"
+
+    @staticmethod
+    def _quick_forecast_cache_key(sku_code: str) -> str:
+        """Cache key for a SKU's get_quick_forecast summary."""
+        return f"forecast:quick:{sku_code}"
+
+    @staticmethod
+    def _get_demand_forecasts_bulk(sku_codes: List[str], days_ahead: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Get demand forecasts for multiple SKUs.
+        Reads and writes the forecast cache with one get_many/set_many round-trip
+        each, and batches baseline/stock queries for the SKUs that miss.
+        Misses are forecast on up to FORECAST_MAX_WORKERS threads.
+        """
+        cache_keys = {
+            sku_code: PredictionService._forecast_cache_key(sku_code, days_ahead)
+            for sku_code in sku_codes
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+
+        forecasts = {}
+        missing = []
+        for sku_code, cache_key in cache_keys.items():
+            forecast = PredictionService._read_forecast_cache_entry(
+                cache_key,
+                cached.get(cache_key),
+                sku_code,
+                days_ahead
+            )
+            if forecast:
+                forecasts[sku_code] = forecast
+            else:
+                missing.append(sku_code)
+
+        if missing:
+            # Baseline demand and stock for all missing SKUs in two queries
+            baseline_map = PredictionService._get_baseline_demand_bulk(missing)
+            stock_map = PredictionService._get_current_stock_bulk(missing)
+
+            def _forecast(sku_code: str) -> Optional[Dict[str, Any]]:
+                return PredictionService.get_demand_forecast(
+                    sku_code,
+                    days_ahead,
+                    baseline_map=baseline_map,
+                    stock_map=stock_map,
+                    use_cache=False
+                )
+
+            def _forecast_slice(sku_slice: List[str]) -> List[Optional[Dict[str, Any]]]:
+                try:
+                    return [_forecast(sku_code) for sku_code in sku_slice]
+                finally:
+                    # Each worker thread has its own DB connection; close it once its slice is done
+                    connection.close()
+
+            max_workers = min(getattr(settings, 'FORECAST_MAX_WORKERS', 1), len(missing))
+            if max_workers <= 1:
+                new_forecasts = dict(zip(missing, map(_forecast, missing)))
+            else:
+                # One slice per thread, so each thread reuses a single connection
+                sku_slices = [missing[i::max_workers] for i in range(max_workers)]
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    slice_results = list(executor.map(_forecast_slice, sku_slices))
+                new_forecasts = {
+                    sku_code: forecast
+                    for sku_slice, results in zip(sku_slices, slice_results)
+                    for sku_code, forecast in zip(sku_slice, results)
+                }
+
+            cache.set_many(
+                {
+                    cache_keys[sku_code]: PredictionService._make_forecast_cache_entry(forecast)
+                    for sku_code, forecast in new_forecasts.items()
+                    if not PredictionService._is_error_fallback(forecast)
+                },
+                FORECAST_CACHE_TIMEOUT
+            )
+            forecasts.update(new_forecasts)
+
+        return forecasts
+
+    @staticmethod
+    def _is_error_fallback(result: Optional[Dict[str, Any]]) -> bool:
+        """True for a missing forecast or the placeholder returned when generation failed."""
+        if not result:
+            return True
+        forecasts = result.get('forecasts') or [{}]
+        return FORECAST_ERROR_REASON in forecasts[0].get('influencing_factors', [])
+
+    @staticmethod
+    def _make_forecast_cache_entry(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap a forecast with its fresh and stale deadlines for caching."""
+        now = time.time()
+        return {
+            'value': result,
+            'fresh_until': now + FORECAST_FRESH_TIMEOUT,
+            'stale_until': now + FORECAST_CACHE_TIMEOUT
+        }
+
+    @staticmethod
+    def _read_forecast_cache_entry(
+        cache_key: str,
+        entry: Optional[Dict[str, Any]],
+        sku_code: str,
+        days_ahead: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached forecast from a cache entry, or None on a miss.
+        Stale entries are still returned, and a background refresh is scheduled.
+        """
+        if not isinstance(entry, dict) or 'fresh_until' not in entry:
+            return None
+
+        now = time.time()
+        if now >= entry['stale_until']:
+            return None
+
+        if now >= entry['fresh_until']:
+            PredictionService._schedule_forecast_refresh(cache_key, sku_code, days_ahead)
+
+        return entry['value']
+
+    @staticmethod
+    def _schedule_forecast_refresh(cache_key: str, sku_code: str, days_ahead: int):
+        """Queue a background recompute of a stale forecast, at most one at a time per key."""
+        lock_key = f"lock:{cache_key}"
+        if not cache.add(lock_key, 1, FORECAST_REFRESH_LOCK_TIMEOUT):
+            return
+
+        try:
+            from forecasting.tasks import refresh_demand_forecast
+            refresh_demand_forecast.delay(sku_code, days_ahead)
+        except Exception as e:
+            logger.warning(f"Could not schedule forecast refresh for {sku_code}: {str(e)}")
+            cache.delete(lock_key)
+
+    @staticmethod
+    def refresh_demand_forecast(sku_code: str, days_ahead: int = 7) -> Optional[Dict[str, Any]]:
+        """
+        Recompute a SKU's demand forecast and replace its cache entry.
+        The quick summary built from the 7-day forecast is dropped with it.
+        If generation fails, the existing (stale) entries are left in place.
+
+        Args:
+            sku_code: Product SKU code
+            days_ahead: Number of days to forecast
+
+        Returns:
+            Dictionary with forecast data, or None if generation failed
+        """
+        cache_key = PredictionService._forecast_cache_key(sku_code, days_ahead)
+        try:
+            result = PredictionService.get_demand_forecast(sku_code, days_ahead, use_cache=False)
+            if PredictionService._is_error_fallback(result):
+                return None
+            cache.set(
+                cache_key,
+                PredictionService._make_forecast_cache_entry(result),
+                FORECAST_CACHE_TIMEOUT
+            )
+            if days_ahead == 7:
+                cache.delete(PredictionService._quick_forecast_cache_key(sku_code))
+            return result
+        finally:
+            cache.delete(f"lock:{cache_key}")
+
+    @staticmethod
+    def _generate_forecast_bundle(
+        forecast_dates: List[datetime],
+        features: ForecastFeatures,
+        model_type: str,
+        include_confidence: bool,
+        baseline_demand: float
+    ) -> ForecastBundle:
+        """
+        Generate daily forecasts from normalized per-date features.
+        Multipliers and confidence bounds are computed for all days at once.
+        """
+        combined_multiplier = np.prod(features.multipliers, axis=0)
+        predicted_quantity = np.maximum((baseline_demand * combined_multiplier).astype(np.int64), 1)
+
+        # Calculate confidence intervals
+        confidence_lower = predicted_quantity
+        confidence_upper = predicted_quantity
+
+        if include_confidence:
+            confidence_range = np.maximum((predicted_quantity * 0.2).astype(np.int64), 5)  # 20% or min 5
+            confidence_lower = np.maximum(predicted_quantity - confidence_range, 0)
+            confidence_upper = predicted_quantity + confidence_range
+
+        # Influencing factors for transparency
+        influencing_factors = []
+        for is_festival, festival_name, trend, temperature_impact in zip(
+            features.is_festival_week,
+            features.festival_name,
+            features.sales_trend_7d,
+            features.temperature_impact
+        ):
+            factors = []
+            if is_festival:
+                factors.append(f"Festival: {festival_name or 'Unknown'}")
+            if trend == 'increasing':
+                factors.append('Increasing trend')
+            if temperature_impact != 1.0:
+                factors.append('Weather impact')
+            influencing_factors.append(factors)
+
+        return ForecastBundle(
+            dates=[forecast_date.date().isoformat() for forecast_date in forecast_dates],
+            predicted_quantity=predicted_quantity,
+            confidence_lower=confidence_lower,
+            confidence_upper=confidence_upper,
+            influencing_factors=influencing_factors,
+            model_type=model_type
+        )
 
     @staticmethod
     def get_category_forecast(
@@ -250,12 +570,14 @@ class PredictionService:
                     'daily_forecast': []
                 }
 
-            # Get all SKUs in category
-            variants = ProductVariant.objects.filter(
-                product__category_id=category_id
-            ).values_list('sku', flat=True)
+            # Get all SKUs in category (evaluated once, no ORDER BY)
+            skus = list(
+                ProductVariant.objects.filter(
+                    product__category_id=category_id
+                ).order_by().values_list('sku', flat=True)
+            )
 
-            if not variants:
+            if not skus:
                 # Return safe default if no variants in category
                 return {
                     'category': category.name,
@@ -267,41 +589,39 @@ class PredictionService:
                     'daily_forecast': []
                 }
 
-            # Get forecasts for all SKUs
-            total_forecasts = []
+            # Get forecasts once per SKU and aggregate in a single pass
+            forecasts_by_sku = PredictionService._get_demand_forecasts_bulk(skus, days_ahead)
+            top_performer_skus = set(skus[:20])  # Rank only the first 20
             top_performers = []
+            daily_totals = {}
 
-            for sku in list(variants)[:20]:  # Limit to first 20
-                forecast = PredictionService.get_demand_forecast(sku, days_ahead)
-                if forecast and forecast.get('forecasts'):
-                    total_demand = sum(f['predicted_quantity'] for f in forecast['forecasts'])
+            for sku in skus:
+                forecast = forecasts_by_sku.get(sku)
+                if not forecast:
+                    continue
+
+                sku_forecasts = forecast.get('forecasts', [])
+                for f in sku_forecasts:
+                    forecast_date = f['date']
+                    daily_totals[forecast_date] = daily_totals.get(forecast_date, 0) + f['predicted_quantity']
+
+                if sku in top_performer_skus and sku_forecasts:
                     top_performers.append({
                         'sku': sku,
-                        'predicted_quantity': total_demand
+                        'predicted_quantity': sum(f['predicted_quantity'] for f in sku_forecasts)
                     })
 
             top_performers.sort(key=lambda x: x['predicted_quantity'], reverse=True)
 
-            # Aggregate daily forecasts
-            daily_totals = {}
-            for sku in variants:
-                forecast = PredictionService.get_demand_forecast(sku, days_ahead)
-                if forecast:
-                    for f in forecast.get('forecasts', []):
-                        date = f['date']
-                        if date not in daily_totals:
-                            daily_totals[date] = 0
-                        daily_totals[date] += f['predicted_quantity']
-
             daily_forecast = [
-                {'date': date, 'predicted_quantity': qty}
-                for date, qty in sorted(daily_totals.items())
+                {'date': forecast_date, 'predicted_quantity': qty}
+                for forecast_date, qty in sorted(daily_totals.items())
             ]
 
             return {
                 'category': category.name,
                 'category_id': category_id,
-                'total_products': len(variants),
+                'total_products': len(skus),
                 'forecast_period': f"{days_ahead} days",
                 'total_predicted_demand': sum(daily_totals.values()),
                 'top_performers': top_performers[:10],
@@ -328,7 +648,12 @@ class PredictionService:
     ) -> List[Dict[str, Any]]:
         """Get current inventory alerts."""
         try:
-            query = InventoryAlert.objects.all()
+            query = InventoryAlert.objects.select_related('product_variant__product').only(
+                'id', 'sku_code', 'alert_type', 'severity', 'current_stock',
+                'predicted_daily_demand', 'days_until_stockout',
+                'recommended_reorder_quantity', 'created_at',
+                'product_variant__product__name'
+            )
 
             if severity:
                 query = query.filter(severity=severity)
@@ -368,6 +693,11 @@ class PredictionService:
         try:
             alerts = InventoryAlert.objects.filter(
                 status__in=['active', 'acknowledged']
+            ).select_related('product_variant__product').only(
+                'sku_code', 'alert_type', 'severity', 'current_stock',
+                'predicted_daily_demand', 'days_until_stockout',
+                'recommended_reorder_quantity',
+                'product_variant__selling_price', 'product_variant__product__name'
             )
 
             if category_id:
@@ -427,7 +757,9 @@ class PredictionService:
     def get_seasonal_insights(sku_code: str) -> Optional[Dict[str, Any]]:
         """Get seasonal insights for a SKU."""
         try:
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
+            variant = ProductVariant.objects.select_related('product__category').only(
+                'sku', 'product__category__name'
+            ).filter(sku=sku_code).first()
             # Continue even if variant not found - use defaults
 
             today = timezone.now()
@@ -438,12 +770,10 @@ class PredictionService:
             upcoming_festivals = get_upcoming_festivals(days_ahead=90)
 
             festivals_with_impact = []
+            today_date = today.date()
             for festival in upcoming_festivals:
-                festival_date = datetime.strptime(
-                    festival['festival_date'],
-                    '%Y-%m-%d'
-                )
-                days_away = (festival_date - today).days
+                festival_date = date.fromisoformat(festival['festival_date'])
+                days_away = (festival_date - today_date).days
 
                 festivals_with_impact.append({
                     'name': festival['name'],
@@ -458,25 +788,21 @@ class PredictionService:
                 str(i): None for i in range(1, 13)
             }
 
-            # Calculate average sales by month for past 3 years
-            for month_num in range(1, 13):
-                sales = HistoricalSalesDaily.objects.filter(
-                    sku_code=sku_code,
-                    sale_date__month=month_num
-                ).aggregate(Avg('quantity_sold'))
+            # Calculate average sales by month in a single GROUP BY
+            monthly_sales = HistoricalSalesDaily.objects.filter(
+                sku_code=sku_code
+            ).annotate(
+                month_num=ExtractMonth('sale_date')
+            ).values('month_num').order_by().annotate(
+                avg_quantity=Avg('quantity_sold')
+            )
 
-                if sales['quantity_sold__avg']:
-                    historical_pattern[str(month_num)] = sales['quantity_sold__avg']
+            for row in monthly_sales:
+                if row['avg_quantity']:
+                    historical_pattern[str(row['month_num'])] = row['avg_quantity']
 
             # Current season
-            if month in [11, 12, 1, 2]:
-                season = 'winter'
-            elif month in [3, 4, 5, 6]:
-                season = 'summer'
-            elif month in [7, 8, 9]:
-                season = 'monsoon'
-            else:
-                season = 'spring'
+            season = MONTH_TO_SEASON[month - 1]
 
             # Get seasonal multiplier
             from forecasting.utils.data_loaders import get_seasonal_multiplier
@@ -504,15 +830,7 @@ class PredictionService:
             logger.error(f"Error getting seasonal insights: {str(e)}")
             # Return safe defaults instead of None
             today = timezone.now()
-            month = today.month
-            if month in [11, 12, 1, 2]:
-                season = 'winter'
-            elif month in [3, 4, 5, 6]:
-                season = 'summer'
-            elif month in [7, 8, 9]:
-                season = 'monsoon'
-            else:
-                season = 'spring'
+            season = MONTH_TO_SEASON[today.month - 1]
 
             return {
                 'sku': sku_code,
@@ -524,7 +842,15 @@ class PredictionService:
 
     @staticmethod
     def get_quick_forecast(sku_code: str) -> Optional[Dict[str, Any]]:
-        """Get quick forecast for product cards/listings."""
+        """
+        Get quick forecast for product cards/listings.
+        The summary is cached on its own so listings don't load the full forecast.
+        """
+        quick_key = PredictionService._quick_forecast_cache_key(sku_code)
+        cached = cache.get(quick_key)
+        if cached:
+            return cached
+
         try:
             # Get forecast - guaranteed to return valid data
             forecast = PredictionService.get_demand_forecast(sku_code, days_ahead=7)
@@ -539,14 +865,19 @@ class PredictionService:
                     'reorder_needed': True
                 }
 
-            next_7_days = sum(f['predicted_quantity'] for f in forecast.get('forecasts', []))
+            forecasts = forecast.get('forecasts', [])
+            quantities = np.fromiter(
+                (f['predicted_quantity'] for f in forecasts),
+                dtype=np.int64,
+                count=len(forecasts)
+            )
+            next_7_days = int(quantities.sum())
 
             # Determine trend
-            forecasts = forecast.get('forecasts', [])
             trend = 'stable'
-            if len(forecasts) > 1:
-                first_half = sum(f['predicted_quantity'] for f in forecasts[:len(forecasts)//2])
-                second_half = sum(f['predicted_quantity'] for f in forecasts[len(forecasts)//2:])
+            if len(quantities) > 1:
+                first_half = int(quantities[:len(quantities)//2].sum())
+                second_half = int(quantities[len(quantities)//2:].sum())
 
                 if first_half > 0:
                     change_pct = ((second_half - first_half) / first_half) * 100
@@ -568,7 +899,7 @@ class PredictionService:
             else:
                 stock_status = 'healthy'
 
-            return {
+            summary = {
                 'sku': sku_code,
                 'next_7_days_demand': next_7_days,
                 'trend': trend,
@@ -576,6 +907,11 @@ class PredictionService:
                 'reorder_needed': stock_status in ['critical', 'low']
             }
 
+            # Cache for 1 hour; summaries of the error placeholder are not cached
+            if not PredictionService._is_error_fallback(forecast):
+                cache.set(quick_key, summary, QUICK_FORECAST_CACHE_TIMEOUT)
+            return summary
+
         except Exception as e:
             logger.error(f"Error getting quick forecast: {str(e)}")
             return None
@@ -605,29 +941,23 @@ class PredictionService:
             import math
             rmse = math.sqrt(stats['rmse']) if stats['rmse'] else 0
 
-            # By model type
-            by_model = {}
-            for accuracy_record in query[:1000]:
-                model_type = accuracy_record.model_type
-                if model_type not in by_model:
-                    by_model[model_type] = []
-                by_model[model_type].append({
-                    'predicted': accuracy_record.predicted_quantity,
-                    'actual': accuracy_record.actual_quantity,
-                    'error': accuracy_record.percentage_error
-                })
+            # By model type, grouped in a single query
+            by_model = query.values('model_type').order_by().annotate(
+                mape=Avg('percentage_error'),
+                squared_sum=Sum(F('percentage_error') * F('percentage_error')),
+                record_count=Count('id')
+            )
 
             model_stats = {}
-            for model_type, values in by_model.items():
-                if values:
-                    mape = sum(v['error'] for v in values) / len(values)
-                    model_stats[model_type] = {
-                        'mape': mape,
-                        'rmse': math.sqrt(sum(v['error']**2 for v in values) / len(values))
+            for row in by_model:
+                if row['record_count']:
+                    model_stats[row['model_type']] = {
+                        'mape': float(row['mape'] or 0),
+                        'rmse': math.sqrt(float(row['squared_sum'] or 0) / row['record_count'])
                     }
                 else:
                     # Ensure all model types have mape and rmse
-                    model_stats[model_type] = {
+                    model_stats[row['model_type']] = {
                         'mape': 0.0,
                         'rmse': 0.0
                     }
@@ -669,61 +999,72 @@ class PredictionService:
 
     # Helper methods
 
-    @staticmethod
-    def _get_default_features() -> Dict[str, float]:
-        """Get default features when actual features cannot be computed."""
-        return {
-            'seasonal_multiplier': 1.0,
-            'festival_multiplier': 1.0,
-            'day_of_week_multiplier': 1.0,
-            'month_multiplier': 1.0,
-            'lifecycle_multiplier': 1.0,
-            'temperature_impact': 1.0,
-            'weather_impact': 1.0,
-            'sales_volatility_7d': 0,
-            'is_festival_week': False,
-            'festival_name': None,
-            'sales_trend_7d': 'stable'
-        }
-
     @staticmethod
     def _get_baseline_demand(sku_code: str) -> float:
         """Get baseline demand from historical data."""
+        baseline = PredictionService._get_baseline_demand_bulk([sku_code])
+        return baseline[sku_code] if baseline else 10.0
+
+    @staticmethod
+    def _get_current_stock(sku_code: str) -> int:
+        """Get current stock for SKU."""
+        stock = PredictionService._get_current_stock_bulk([sku_code])
+        return stock[sku_code] if stock else 0
+
+    @staticmethod
+    def _get_baseline_demand_bulk(sku_codes: List[str]) -> Optional[Dict[str, float]]:
+        """
+        Get baseline demand for multiple SKUs in one GROUP BY query.
+        SKUs without recent sales get the default baseline; returns None on error.
+        """
         try:
-            avg = HistoricalSalesDaily.objects.filter(
-                sku_code=sku_code,
+            rows = HistoricalSalesDaily.objects.filter(
+                sku_code__in=sku_codes,
                 sale_date__gte=timezone.now() - timedelta(days=30)
-            ).aggregate(Avg('quantity_sold'))
+            ).values('sku_code').order_by().annotate(avg_quantity=Avg('quantity_sold'))
 
-            return avg['quantity_sold__avg'] or 10.0
+            averages = {row['sku_code']: row['avg_quantity'] for row in rows}
+            return {sku_code: averages.get(sku_code) or 10.0 for sku_code in sku_codes}
 
-        except:
-            return 10.0
+        except Exception as e:
+            logger.warning(f"Error getting bulk baseline demand: {str(e)}")
+            return None
 
     @staticmethod
-    def _get_current_stock(sku_code: str) -> int:
-        """Get current stock for SKU."""
+    def _get_current_stock_bulk(sku_codes: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Get current stock for multiple SKUs in one query.
+        Unknown SKUs have zero stock; returns None on error.
+        """
         try:
-            variant = ProductVariant.objects.filter(sku=sku_code).first()
-            if variant and hasattr(variant, 'stock_quantity'):
-                return variant.stock_quantity or 0
-            return 0
-        except:
-            return 0
+            rows = ProductVariant.objects.filter(
+                sku__in=sku_codes
+            ).values_list('sku', 'stock_quantity')
+
+            stock = {sku: stock_quantity or 0 for sku, stock_quantity in rows}
+            return {sku_code: stock.get(sku_code, 0) for sku_code in sku_codes}
+
+        except Exception as e:
+            logger.warning(f"Error getting bulk current stock: {str(e)}")
+            return None
 
     @staticmethod
-    def _calculate_days_to_stockout(sku_code: str, forecasts: List[Dict]) -> float:
-        """Calculate days until stockout."""
+    def _calculate_days_to_stockout(
+        sku_code: str,
+        quantities: np.ndarray,
+        current_stock: Optional[int] = None
+    ) -> float:
+        """Calculate days until stockout from daily predicted quantities."""
         try:
-            current_stock = PredictionService._get_current_stock(sku_code)
-            cumulative = 0
-            today = timezone.now().date()
+            if current_stock is None:
+                current_stock = PredictionService._get_current_stock(sku_code)
 
-            for day_index, forecast in enumerate(forecasts, start=1):
-                cumulative += forecast['predicted_quantity']
-                if cumulative >= current_stock:
-                    # Return the number of days from today
-                    return float(day_index)
+            # First day on which cumulative demand covers the current stock
+            cumulative = np.cumsum(quantities)
+            day_index = int(np.searchsorted(cumulative, current_stock, side='left'))
+            if day_index < len(cumulative):
+                # Return the number of days from today
+                return float(day_index + 1)
 
             return 999.0
 
@@ -731,13 +1072,11 @@ class PredictionService:
             return 999.0
 
     @staticmethod
-    def _calculate_reorder_quantity(sku_code: str, forecasts: List[Dict]) -> int:
-        """Calculate recommended reorder quantity."""
+    def _calculate_reorder_quantity(sku_code: str, quantities: np.ndarray) -> int:
+        """Calculate recommended reorder quantity from daily predicted quantities."""
         try:
             # 30-day forecast plus 7-day safety stock
-            total_30d = sum(
-                f['predicted_quantity'] for f in forecasts[:min(30, len(forecasts))]
-            )
+            total_30d = int(quantities[:30].sum())
             safety_stock = int(total_30d * 0.3)  # 30% safety margin
 
             return int(total_30d + safety_stock)
@@ -3,24 +3,30 @@ Google Trends data collection service using pytrends (Free, no API key required)
 Fetches search trends for product categories and keywords.
 """
 
+import re
 import time
+import random
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from django.core.cache import cache
 from django.utils import timezone
 
-try:
+from forecasting.utils.data_loaders import CACHE_TTLS, get_or_fetch_cached
+
+if TYPE_CHECKING:
     from pytrends.request import TrendReq
-except ImportError:
-    raise ImportError("pytrends library is required. Install with: pip install pytrends")
 
 logger = logging.getLogger(__name__)
 
 # Rate limiting parameters
-MIN_DELAY_BETWEEN_REQUESTS = 3  # Seconds
+MIN_DELAY_BETWEEN_REQUESTS = 3  # Seconds, across all collectors and threads in the process
+MAX_CONCURRENT_REQUESTS = 4  # Keep low to avoid Google 429s
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # Seconds
+RETRY_DELAY = 5  # Seconds, base for exponential backoff
+MAX_RETRY_DELAY = 30  # Seconds, backoff cap
 
 # Default search keywords for Indian market
 DEFAULT_KEYWORDS = {
@@ -32,6 +38,59 @@ DEFAULT_KEYWORDS = {
     'educational': ['learning toys', 'educational games', 'building blocks'],
 }
 
+# Words marking a trending search as product-related, matched as substrings in one pass
+PRODUCT_KEYWORDS = ('kids', 'children', 'baby', 'toys', 'clothes', 'books', 'games')
+PRODUCT_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, PRODUCT_KEYWORDS)), re.IGNORECASE)
+
+class _RequestSpacer:
+    """Thread-safe limiter allowing one request per interval; callers reserve slots in order."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_request_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserve the next request slot, sleeping until it arrives."""
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time)
+            self._next_request_time = request_time + self.interval
+
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+# Shared by all collectors in the process (each task run builds a new collector,
+# and overlapping runs must still share Google's budget)
+_trends_rate_limiter = _RequestSpacer(MIN_DELAY_BETWEEN_REQUESTS)
+
+# pytrends clients per thread, keyed by timezone offset. Shared across collector
+# instances because creating a TrendReq makes an HTTP round-trip for Google cookies;
+# batches run on the long-lived _trends_executor threads, so each thread's client is reused.
+_pytrends_clients = threading.local()
+
+_trends_executor = None
+_trends_executor_lock = threading.Lock()
+
+
+def _get_trends_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool for keyword batches.
+    Created on first use, so prefork workers build it after forking.
+    Its threads are shared by every collector, so they pace requests with the
+    process-wide _trends_rate_limiter rather than any per-collector state.
+    """
+    global _trends_executor
+
+    with _trends_executor_lock:
+        if _trends_executor is None:
+            _trends_executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_REQUESTS,
+                thread_name_prefix='trends'
+            )
+        return _trends_executor
+
 
 class GoogleTrendsCollector:
     """Collect Google Trends data using pytrends library."""
@@ -46,15 +105,37 @@ class GoogleTrendsCollector:
         """
         self.geo = geo
         self.tz = tz
-        self.pytrends = TrendReq(hl='en-IN', tz=tz)
-        self.last_request_time = 0
+
+    @property
+    def pytrends(self) -> 'TrendReq':
+        """
+        pytrends client for the current thread (TrendReq holds per-payload state),
+        reused by later collectors on the same thread.
+        pytrends is imported on first use, so processes that never collect
+        trends don't need it installed or loaded.
+        """
+        clients = getattr(_pytrends_clients, 'by_tz', None)
+        if clients is None:
+            clients = _pytrends_clients.by_tz = {}
+
+        client = clients.get(self.tz)
+        if client is None:
+            try:
+                from pytrends.request import TrendReq
+            except ImportError:
+                raise ImportError("pytrends library is required. Install with: pip install pytrends")
+
+            client = TrendReq(hl='en-IN', tz=self.tz)
+            clients[self.tz] = client
+        return client
 
     def _apply_rate_limit(self):
-        """Apply rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < MIN_DELAY_BETWEEN_REQUESTS:
-            time.sleep(MIN_DELAY_BETWEEN_REQUESTS - elapsed)
-        self.last_request_time = time.time()
+        """
+        Apply rate limiting between requests.
+        Uses the process-wide limiter, so all collectors and threads together
+        stay at one request per MIN_DELAY_BETWEEN_REQUESTS.
+        """
+        _trends_rate_limiter.acquire()
 
     def _retry_request(self, func, *args, **kwargs):
         """
@@ -73,12 +154,31 @@ class GoogleTrendsCollector:
                 return func(*args, **kwargs)
             except Exception as e:
                 if attempt < MAX_RETRIES - 1:
-                    logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying...")
-                    time.sleep(RETRY_DELAY * (attempt + 1))  # Exponential backoff
+                    # Full-jitter exponential backoff, so parallel workers don't retry in lockstep
+                    delay = random.uniform(0, min(MAX_RETRY_DELAY, RETRY_DELAY * (2 ** attempt)))
+                    retry_after = self._get_retry_after(e)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
                 else:
                     logger.error(f"Failed after {MAX_RETRIES} attempts: {str(e)}")
                     return None
 
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """Seconds from the Retry-After header of the error's HTTP response, if any."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+
+        try:
+            return max(0.0, float(headers.get('Retry-After')))
+        except (TypeError, ValueError):
+            # Missing, or given as an HTTP date
+            return None
+
     def get_interest_over_time(
         self,
         keywords: List[str],
@@ -97,46 +197,43 @@ class GoogleTrendsCollector:
             Dictionary with interest data or None on error
         """
         cache_key = f"trends:interest:{':'.join(sorted(keywords[:max_keywords]))}:{timeframe}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
 
         # Limit to max 5 keywords (API limitation)
         keywords = keywords[:max_keywords]
 
-        try:
-            self._apply_rate_limit()
+        def _fetch() -> Optional[Dict]:
+            try:
+                self._apply_rate_limit()
 
-            def _fetch():
-                self.pytrends.build_payload(
-                    keywords,
-                    cat=0,
-                    timeframe=timeframe,
-                    geo=self.geo,
-                    gprop=''
-                )
-                return self.pytrends.interest_over_time()
+                def _request():
+                    self.pytrends.build_payload(
+                        keywords,
+                        cat=0,
+                        timeframe=timeframe,
+                        geo=self.geo,
+                        gprop=''
+                    )
+                    return self.pytrends.interest_over_time()
 
-            df = self._retry_request(_fetch)
+                df = self._retry_request(_request)
 
-            if df is None or df.empty:
-                return None
+                if df is None or df.empty:
+                    return None
 
-            # Convert to dict for caching
-            result = {
-                'keywords': keywords,
-                'timeframe': timeframe,
-                'data': df.to_dict('index'),
-                'collected_at': timezone.now().isoformat()
-            }
+                # Convert to a columnar dict for caching
+                return {
+                    'keywords': keywords,
+                    'timeframe': timeframe,
+                    'data': self._frame_to_columnar(df),
+                    'collected_at': timezone.now().isoformat()
+                }
 
-            # Cache for 7 days
-            cache.set(cache_key, result, 86400 * 7)
-            return result
+            except Exception as e:
+                logger.error(f"Error getting interest over time: {str(e)}")
+                return None
 
-        except Exception as e:
-            logger.error(f"Error getting interest over time: {str(e)}")
-            return None
+        # Cache for 1 day
+        return get_or_fetch_cached(cache_key, _fetch, CACHE_TTLS['interest'])
 
     def get_related_queries(self, keyword: str) -> Optional[Dict]:
         """
@@ -149,35 +246,32 @@ class GoogleTrendsCollector:
             Dictionary with related queries or None on error
         """
         cache_key = f"trends:related:{keyword.lower()}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
 
-        try:
-            self._apply_rate_limit()
+        def _fetch() -> Optional[Dict]:
+            try:
+                self._apply_rate_limit()
 
-            def _fetch():
-                self.pytrends.build_payload([keyword], geo=self.geo)
-                return self.pytrends.related_queries()
+                def _request():
+                    self.pytrends.build_payload([keyword], geo=self.geo)
+                    return self.pytrends.related_queries()
 
-            related = self._retry_request(_fetch)
+                related = self._retry_request(_request)
 
-            if not related:
-                return None
+                if not related:
+                    return None
 
-            result = {
-                'keyword': keyword,
-                'related_queries': related,
-                'collected_at': timezone.now().isoformat()
-            }
+                return {
+                    'keyword': keyword,
+                    'related_queries': related,
+                    'collected_at': timezone.now().isoformat()
+                }
 
-            # Cache for 7 days
-            cache.set(cache_key, result, 86400 * 7)
-            return result
+            except Exception as e:
+                logger.error(f"Error getting related queries for '{keyword}': {str(e)}")
+                return None
 
-        except Exception as e:
-            logger.error(f"Error getting related queries for '{keyword}': {str(e)}")
-            return None
+        # Cache for 7 days
+        return get_or_fetch_cached(cache_key, _fetch, CACHE_TTLS['related'])
 
     def get_trending_searches(self) -> Optional[List[str]]:
         """
@@ -187,30 +281,27 @@ class GoogleTrendsCollector:
             List of trending search terms or None on error
         """
         cache_key = "trends:trending:india"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
 
-        try:
-            self._apply_rate_limit()
+        def _fetch() -> Optional[List[str]]:
+            try:
+                self._apply_rate_limit()
 
-            def _fetch():
-                return self.pytrends.trending_searches(pn='india')
+                def _request():
+                    return self.pytrends.trending_searches(pn='india')
 
-            trends_df = self._retry_request(_fetch)
+                trends_df = self._retry_request(_request)
 
-            if trends_df is None or trends_df.empty:
-                return None
+                if trends_df is None or trends_df.empty:
+                    return None
 
-            trending = trends_df[0].tolist()
+                return trends_df[0].tolist()
 
-            # Cache for 1 day (trends change frequently)
-            cache.set(cache_key, trending, 86400)
-            return trending
+            except Exception as e:
+                logger.error(f"Error getting trending searches: {str(e)}")
+                return None
 
-        except Exception as e:
-            logger.error(f"Error getting trending searches: {str(e)}")
-            return None
+        # Cache for 1 hour (trending searches change quickly)
+        return get_or_fetch_cached(cache_key, _fetch, CACHE_TTLS['trending'])
 
     def get_category_trends(
         self,
@@ -219,6 +310,8 @@ class GoogleTrendsCollector:
     ) -> Dict[str, Optional[Dict]]:
         """
         Get trends for multiple product categories.
+        Keyword batches from all categories are fetched on the shared trends
+        thread pool; the rate limit still spaces out the actual requests.
 
         Args:
             category_keywords: Dictionary mapping categories to keyword lists
@@ -227,24 +320,32 @@ class GoogleTrendsCollector:
         Returns:
             Dictionary mapping categories to trend data
         """
-        results = {}
+        # Collect in batches of 5 (API limit)
+        batches = [
+            (category, keywords[i:i+5])
+            for category, keywords in category_keywords.items()
+            for i in range(0, len(keywords), 5)
+        ]
 
-        for category, keywords in category_keywords.items():
-            logger.info(f"Collecting trends for category: {category}")
+        def _fetch(batch: Tuple[str, List[str]]) -> Optional[Dict]:
+            category, keywords = batch
+            logger.info(f"Collecting trends for category: {category} ({', '.join(keywords)})")
+            return self.get_interest_over_time(keywords, timeframe)
 
-            # Collect in batches of 5 (API limit)
-            all_data = {}
-            for i in range(0, len(keywords), 5):
-                batch = keywords[i:i+5]
-                trend_data = self.get_interest_over_time(batch, timeframe)
+        # map keeps batch order so per-category merges match the serial order
+        batch_results = list(_get_trends_executor().map(_fetch, batches))
 
-                if trend_data:
-                    all_data.update(trend_data.get('data', {}))
+        data_by_category = {category: [] for category in category_keywords}
+        for (category, _), trend_data in zip(batches, batch_results):
+            if trend_data and trend_data.get('data'):
+                data_by_category[category].append(trend_data['data'])
 
-            if all_data:
+        results = {}
+        for category, batch_data in data_by_category.items():
+            if batch_data:
                 results[category] = {
                     'category': category,
-                    'data': all_data,
+                    'data': self._merge_columnar(batch_data),
                     'collected_at': timezone.now().isoformat()
                 }
             else:
@@ -252,6 +353,43 @@ class GoogleTrendsCollector:
 
         return results
 
+    @staticmethod
+    def _frame_to_columnar(df) -> Dict:
+        """
+        Convert an interest-over-time DataFrame to a compact columnar dict
+        ({'index': [ISO dates], 'columns': [...], 'data': [[row values], ...]}).
+        """
+        df = df.copy()
+        df.index = df.index.strftime('%Y-%m-%d')
+        return df.to_dict('split')
+
+    @staticmethod
+    def _columnar_to_frame(data: Dict):
+        """Rebuild a date-indexed DataFrame from a columnar dict."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            data['data'],
+            index=pd.to_datetime(data['index']),
+            columns=data['columns']
+        )
+
+    @staticmethod
+    def _merge_columnar(batch_data: List[Dict]) -> Dict:
+        """Merge columnar batches for the same timeframe into one, side by side."""
+        if len(batch_data) == 1:
+            return batch_data[0]
+
+        import pandas as pd
+
+        merged = pd.concat(
+            [GoogleTrendsCollector._columnar_to_frame(data) for data in batch_data],
+            axis=1
+        )
+        # Every batch carries its own isPartial column
+        merged = merged.loc[:, ~merged.columns.duplicated()]
+        return GoogleTrendsCollector._frame_to_columnar(merged)
+
     def analyze_keyword_trends(
         self,
         keywords: List[str],
@@ -273,34 +411,46 @@ class GoogleTrendsCollector:
             return None
 
         try:
-            import pandas as pd
-            from statistics import mean, stdev
-
-            # Convert data to DataFrame
-            df = pd.DataFrame(interest_data['data']).T
-            df.index = pd.to_datetime(df.index)
+            data = interest_data['data']
+            columns = {column: i for i, column in enumerate(data['columns'])}
+            present = [keyword for keyword in dict.fromkeys(keywords) if keyword in columns]
+            if not present or not data['data']:
+                values = np.empty((0, len(present)))
+            else:
+                values = np.array(data['data'], dtype=object)[:, [columns[keyword] for keyword in present]]
+                values = values.astype(float)
+
+            # Statistics for all keywords in one pass, ignoring zeros
+            positive = np.where(values > 0, values, np.nan)
+            counts = np.count_nonzero(~np.isnan(positive), axis=0)
+            keep = counts > 0
+            positive = positive[:, keep]
+            present = [keyword for keyword, kept in zip(present, keep) if kept]
+            counts = counts[keep]
+
+            means = np.nanmean(positive, axis=0)
+            maxs = np.nanmax(positive, axis=0)
+            mins = np.nanmin(positive, axis=0)
+            std_devs = np.array([
+                np.nanstd(positive[:, i], ddof=1) if count > 1 else 0.0
+                for i, count in enumerate(counts)
+            ])
 
             analysis = {
                 'keywords': keywords,
                 'timeframe': timeframe,
-                'trend_statistics': {}
+                'trend_statistics': {
+                    keyword: {
+                        'mean': float(means[i]),
+                        'max': float(maxs[i]),
+                        'min': float(mins[i]),
+                        'std_dev': float(std_devs[i]),
+                        'trend': self._calculate_trend(positive[:, i][~np.isnan(positive[:, i])])
+                    }
+                    for i, keyword in enumerate(present)
+                }
             }
 
-            # Calculate statistics for each keyword
-            for keyword in keywords:
-                if keyword in df.columns:
-                    values = df[keyword].values.tolist()
-                    values = [v for v in values if v > 0]  # Filter out zeros
-
-                    if values:
-                        analysis['trend_statistics'][keyword] = {
-                            'mean': mean(values),
-                            'max': max(values),
-                            'min': min(values),
-                            'std_dev': stdev(values) if len(values) > 1 else 0,
-                            'trend': self._calculate_trend(values)
-                        }
-
             analysis['collected_at'] = timezone.now().isoformat()
             return analysis
 
@@ -308,23 +458,25 @@ class GoogleTrendsCollector:
             logger.error(f"Error analyzing keyword trends: {str(e)}")
             return interest_data  # Return raw data on analysis error
 
-    def _calculate_trend(self, values: List[float]) -> str:
+    def _calculate_trend(self, values) -> str:
         """
         Calculate trend direction (increasing, decreasing, stable).
 
         Args:
-            values: List of numeric values
+            values: Sequence or array of numeric values
 
         Returns:
             Trend string: 'increasing', 'decreasing', or 'stable'
         """
-        if len(values) < 2:
+        values = np.asarray(values, dtype=float)
+        if values.size < 2:
             return 'stable'
 
-        # Compare first half vs second half
-        mid = len(values) // 2
-        first_half_avg = sum(values[:mid]) / len(values[:mid])
-        second_half_avg = sum(values[mid:]) / len(values[mid:])
+        # Compare first half vs second half, both from one running sum
+        mid = values.size // 2
+        cumulative = values.cumsum()
+        first_half_avg = cumulative[mid - 1] / mid
+        second_half_avg = (cumulative[-1] - cumulative[mid - 1]) / (values.size - mid)
 
         change_pct = ((second_half_avg - first_half_avg) / first_half_avg * 100) if first_half_avg > 0 else 0
 
@@ -360,13 +512,7 @@ class GoogleTrendsCollector:
             return None
 
         # Filter for product-related trending searches
-        product_keywords = [
-            t for t in trending
-            if any(
-                word in t.lower()
-                for word in ['kids', 'children', 'baby', 'toys', 'clothes', 'books', 'games']
-            )
-        ]
+        product_keywords = [t for t in trending if PRODUCT_KEYWORD_PATTERN.search(t)]
 
         if product_keywords:
             analysis = self.analyze_keyword_trends(product_keywords[:5], 'today 1-m')
@@ -3,13 +3,22 @@ Weather data collection service using Open-Meteo API (Free, no API key required)
 Fetches current and historical weather data for Indian cities.
 """
 
+import orjson
 import requests
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import chain
 from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.core.cache import cache
 from django.utils import timezone
 
+from forecasting.utils.data_loaders import CACHE_TTLS, get_or_fetch_cached
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -17,16 +26,38 @@ OPENMETEO_GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 OPENMETEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 OPENMETEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
 
-# Default Indian cities for weather collection
+# HTTP connection pooling and retries (geocoding, forecast and archive hosts)
+HTTP_POOL_CONNECTIONS = 3
+HTTP_POOL_MAXSIZE = 8
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 1.0
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Open-Meteo request rate per process (free tier allows 600/minute)
+OPENMETEO_REQUESTS_PER_SECOND = 10
+OPENMETEO_BURST = 10
+
+# Long historical ranges are fetched as parallel windows of this many days
+HISTORICAL_CHUNK_DAYS = 90
+HISTORICAL_MAX_WORKERS = 4
+
+# The archive revises its most recent days, so only windows ending at least this
+# many days ago are cached forever; newer ones expire like forecasts
+HISTORICAL_SETTLED_DAYS = 7
+
+# How long forecast bodies are kept for revalidation with ETag/Last-Modified
+CONDITIONAL_CACHE_TIMEOUT = 86400  # 1 day
+
+# Default Indian cities for weather collection (fixed coordinates, no geocoding needed)
 DEFAULT_LOCATIONS = {
-    'Mumbai': {'region': 'west'},
-    'Delhi': {'region': 'north'},
-    'Bangalore': {'region': 'south'},
-    'Chennai': {'region': 'south'},
-    'Kolkata': {'region': 'east'},
-    'Hyderabad': {'region': 'south'},
-    'Pune': {'region': 'west'},
-    'Ahmedabad': {'region': 'west'},
+    'Mumbai': {'region': 'west', 'latitude': 19.0760, 'longitude': 72.8777, 'admin1': 'Maharashtra'},
+    'Delhi': {'region': 'north', 'latitude': 28.6139, 'longitude': 77.2090, 'admin1': 'Delhi'},
+    'Bangalore': {'region': 'south', 'latitude': 12.9716, 'longitude': 77.5946, 'admin1': 'Karnataka'},
+    'Chennai': {'region': 'south', 'latitude': 13.0827, 'longitude': 80.2707, 'admin1': 'Tamil Nadu'},
+    'Kolkata': {'region': 'east', 'latitude': 22.5726, 'longitude': 88.3639, 'admin1': 'West Bengal'},
+    'Hyderabad': {'region': 'south', 'latitude': 17.3850, 'longitude': 78.4867, 'admin1': 'Telangana'},
+    'Pune': {'region': 'west', 'latitude': 18.5204, 'longitude': 73.8567, 'admin1': 'Maharashtra'},
+    'Ahmedabad': {'region': 'west', 'latitude': 23.0225, 'longitude': 72.5714, 'admin1': 'Gujarat'},
 }
 
 WEATHER_CODES = {
@@ -56,6 +87,41 @@ WEATHER_CODES = {
     99: 'Thunderstorm with heavy hail',
 }
 
+# WMO codes are small ints (0-99), so descriptions are looked up by index
+WEATHER_CODES_LUT = tuple(WEATHER_CODES.get(code, 'Unknown') for code in range(100))
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() only waits once the burst is used up."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it has accrued if the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance reserves a future token for this caller
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by all collectors in the process, since Open-Meteo limits per client IP
+_openmeteo_rate_limiter = _TokenBucket(OPENMETEO_REQUESTS_PER_SECOND, OPENMETEO_BURST)
+
+# One pooled HTTP session per process, created on first use
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
 
 class WeatherDataCollector:
     """Collect weather data from Open-Meteo API (Free)."""
@@ -68,11 +134,53 @@ class WeatherDataCollector:
             timeout: Request timeout in seconds
         """
         self.timeout = timeout
-        self.session = requests.Session()
+        self.session = self._get_shared_session()
+
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """
+        Get the process-wide HTTP session, so collectors created per task or
+        request reuse the same keep-alive connections.
+        """
+        global _shared_session
+
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = cls._create_session()
+            return _shared_session
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create an HTTP session with pooled keep-alive connections per host
+        and exponential-backoff retries on rate limits and server errors.
+        """
+        retry = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        return session
+
+    def _get(self, url: str, params: Dict, headers: Optional[Dict] = None) -> requests.Response:
+        """Rate-limited GET against an Open-Meteo endpoint."""
+        _openmeteo_rate_limiter.acquire()
+        return self.session.get(url, params=params, headers=headers, timeout=self.timeout)
 
     def geocode_location(self, location_name: str, country: str = "India") -> Optional[Dict]:
         """
         Get coordinates for a location using Open-Meteo geocoding API.
+        Default Indian cities use their fixed coordinates without an API call.
 
         Args:
             location_name: City name
@@ -81,45 +189,50 @@ class WeatherDataCollector:
         Returns:
             Dictionary with lat, lon, name or None if not found
         """
-        cache_key = f"weather:geocode:{location_name.lower()}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-
-        try:
-            params = {
+        default_location = DEFAULT_LOCATIONS.get(location_name)
+        if default_location and country == "India":
+            return {
                 'name': location_name,
+                'latitude': default_location['latitude'],
+                'longitude': default_location['longitude'],
                 'country': country,
-                'limit': 1,
-                'language': 'en'
+                'admin1': default_location['admin1'],
+                'timezone': 'Asia/Kolkata'
             }
 
-            response = self.session.get(
-                OPENMETEO_GEOCODING_URL,
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if data.get('results'):
-                result = data['results'][0]
-                location_info = {
-                    'name': result.get('name'),
-                    'latitude': result.get('latitude'),
-                    'longitude': result.get('longitude'),
-                    'country': result.get('country'),
-                    'admin1': result.get('admin1'),
-                    'timezone': result.get('timezone')
+        cache_key = f"weather:geocode:{location_name.lower()}"
+
+        def _fetch() -> Optional[Dict]:
+            try:
+                params = {
+                    'name': location_name,
+                    'country': country,
+                    'limit': 1,
+                    'language': 'en'
                 }
-                # Cache for 30 days
-                cache.set(cache_key, location_info, 86400 * 30)
-                return location_info
 
-        except Exception as e:
-            logger.error(f"Error geocoding location {location_name}: {str(e)}")
+                response = self._get(OPENMETEO_GEOCODING_URL, params)
+                response.raise_for_status()
 
-        return None
+                data = orjson.loads(response.content)
+                if data.get('results'):
+                    result = data['results'][0]
+                    return {
+                        'name': result.get('name'),
+                        'latitude': result.get('latitude'),
+                        'longitude': result.get('longitude'),
+                        'country': result.get('country'),
+                        'admin1': result.get('admin1'),
+                        'timezone': result.get('timezone')
+                    }
+
+            except Exception as e:
+                logger.error(f"Error geocoding location {location_name}: {str(e)}")
+
+            return None
+
+        # Coordinates don't move, so cache forever
+        return get_or_fetch_cached(cache_key, _fetch, CACHE_TTLS['geocode'])
 
     def fetch_current_weather(self, latitude: float, longitude: float) -> Optional[Dict]:
         """
@@ -132,37 +245,40 @@ class WeatherDataCollector:
         Returns:
             Dictionary with weather data or None on error
         """
-        try:
-            params = {
-                'latitude': latitude,
-                'longitude': longitude,
-                'current': [
-                    'temperature_2m',
-                    'relative_humidity_2m',
-                    'apparent_temperature',
-                    'precipitation',
-                    'weather_code',
-                    'wind_speed_10m',
-                    'wind_direction_10m'
-                ],
-                'timezone': 'Asia/Kolkata'
-            }
+        return self.fetch_current_weather_batch([(latitude, longitude)])[0]
 
-            response = self.session.get(
-                OPENMETEO_FORECAST_URL,
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+    def fetch_current_weather_batch(self, coords: List[Tuple[float, float]]) -> List[Optional[Dict]]:
+        """
+        Fetch current weather for several coordinates in one API call.
 
-            data = response.json()
-            if data.get('current'):
-                return self._parse_weather_data(data['current'])
+        Args:
+            coords: List of (latitude, longitude) pairs
 
-        except Exception as e:
-            logger.error(f"Error fetching current weather for ({latitude}, {longitude}): {str(e)}")
+        Returns:
+            List of weather dictionaries (None on error), parallel to coords
+        """
+        params = {
+            'current': [
+                'temperature_2m',
+                'relative_humidity_2m',
+                'apparent_temperature',
+                'precipitation',
+                'weather_code',
+                'wind_speed_10m',
+                'wind_direction_10m'
+            ],
+            'timezone': 'Asia/Kolkata'
+        }
 
-        return None
+        results = self._fetch_forecast_batch(
+            coords, params, 'current weather',
+            cache_prefix="weather:current",
+            cache_timeout=CACHE_TTLS['weather_current']
+        )
+        return [
+            self._parse_weather_data(data['current']) if data and data.get('current') else None
+            for data in results
+        ]
 
     def fetch_forecast(self, latitude: float, longitude: float, days: int = 7) -> Optional[List[Dict]]:
         """
@@ -176,39 +292,109 @@ class WeatherDataCollector:
         Returns:
             List of daily forecast dictionaries or None on error
         """
-        try:
-            # Limit to 16 days (API maximum)
-            days = min(days, 16)
-
-            params = {
-                'latitude': latitude,
-                'longitude': longitude,
-                'daily': [
-                    'temperature_2m_max',
-                    'temperature_2m_min',
-                    'precipitation_sum',
-                    'weather_code',
-                    'wind_speed_10m_max'
-                ],
-                'timezone': 'Asia/Kolkata',
-                'forecast_days': days
-            }
+        return self.fetch_forecast_batch([(latitude, longitude)], days=days)[0]
 
-            response = self.session.get(
-                OPENMETEO_FORECAST_URL,
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+    def fetch_forecast_batch(
+        self,
+        coords: List[Tuple[float, float]],
+        days: int = 7
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Fetch N-day weather forecasts for several coordinates in one API call.
 
-            data = response.json()
-            if data.get('daily'):
-                return self._parse_daily_forecast(data['daily'])
+        Args:
+            coords: List of (latitude, longitude) pairs
+            days: Number of days to forecast (max 16)
 
-        except Exception as e:
-            logger.error(f"Error fetching forecast for ({latitude}, {longitude}): {str(e)}")
+        Returns:
+            List of daily forecast lists (None on error), parallel to coords
+        """
+        params = {
+            'daily': [
+                'temperature_2m_max',
+                'temperature_2m_min',
+                'precipitation_sum',
+                'weather_code',
+                'wind_speed_10m_max'
+            ],
+            'timezone': 'Asia/Kolkata',
+            # Limit to 16 days (API maximum)
+            'forecast_days': min(days, 16)
+        }
 
-        return None
+        results = self._fetch_forecast_batch(
+            coords, params, 'forecast',
+            cache_prefix=f"weather:forecast:{params['forecast_days']}",
+            cache_timeout=CACHE_TTLS['weather_forecast']
+        )
+        return [
+            self._parse_daily_forecast(data['daily']) if data and data.get('daily') else None
+            for data in results
+        ]
+
+    def _fetch_forecast_batch(
+        self,
+        coords: List[Tuple[float, float]],
+        params: Dict,
+        description: str,
+        cache_prefix: str,
+        cache_timeout: Optional[int]
+    ) -> List[Optional[Dict]]:
+        """
+        Call the forecast API once for several coordinates, caching the batch.
+        Open-Meteo takes comma-separated latitudes/longitudes and returns one
+        result per coordinate (a single object when only one is requested).
+        When the previous response carried an ETag or Last-Modified header the
+        request is conditional, and a 304 reuses the previous body.
+        """
+        if not coords:
+            return []
+
+        latitudes = ','.join(str(latitude) for latitude, _ in coords)
+        longitudes = ','.join(str(longitude) for _, longitude in coords)
+        cache_key = f"{cache_prefix}:{latitudes}:{longitudes}"
+        conditional_key = f"{cache_key}:conditional"
+
+        def _fetch() -> Optional[List[Dict]]:
+            try:
+                previous = cache.get(conditional_key)
+                headers = {}
+                if previous:
+                    if previous.get('etag'):
+                        headers['If-None-Match'] = previous['etag']
+                    if previous.get('last_modified'):
+                        headers['If-Modified-Since'] = previous['last_modified']
+
+                response = self._get(
+                    OPENMETEO_FORECAST_URL,
+                    {**params, 'latitude': latitudes, 'longitude': longitudes},
+                    headers=headers or None
+                )
+                if response.status_code == 304 and previous:
+                    return previous['results']
+                response.raise_for_status()
+
+                data = orjson.loads(response.content)
+                results = data if isinstance(data, list) else [data]
+                if len(results) == len(coords):
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        cache.set(conditional_key, {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'results': results
+                        }, CONDITIONAL_CACHE_TIMEOUT)
+                    return results
+
+                logger.error(f"Expected {len(coords)} {description} results, got {len(results)}")
+
+            except Exception as e:
+                logger.error(f"Error fetching {description} for {coords}: {str(e)}")
+
+            return None
+
+        return get_or_fetch_cached(cache_key, _fetch, cache_timeout) or [None] * len(coords)
 
     def fetch_historical_weather(
         self,
@@ -219,6 +405,8 @@ class WeatherDataCollector:
     ) -> Optional[List[Dict]]:
         """
         Fetch historical weather data for a date range.
+        Ranges longer than HISTORICAL_CHUNK_DAYS are split into windows that
+        are fetched (and cached) separately, in parallel.
 
         Args:
             latitude: Location latitude
@@ -230,35 +418,89 @@ class WeatherDataCollector:
             List of daily weather dictionaries or None on error
         """
         try:
-            params = {
-                'latitude': latitude,
-                'longitude': longitude,
-                'start_date': start_date,
-                'end_date': end_date,
-                'daily': [
-                    'temperature_2m_max',
-                    'temperature_2m_min',
-                    'precipitation_sum',
-                    'weather_code'
-                ],
-                'timezone': 'Asia/Kolkata'
-            }
+            chunks = self._split_date_range(start_date, end_date, HISTORICAL_CHUNK_DAYS)
+        except ValueError as e:
+            logger.error(f"Invalid historical weather range {start_date} - {end_date}: {str(e)}")
+            return None
+
+        if len(chunks) <= 1:
+            return self._fetch_historical_chunk(latitude, longitude, start_date, end_date)
+
+        with ThreadPoolExecutor(max_workers=min(HISTORICAL_MAX_WORKERS, len(chunks))) as executor:
+            chunk_results = list(executor.map(
+                lambda chunk: self._fetch_historical_chunk(latitude, longitude, *chunk),
+                chunks
+            ))
 
-            response = self.session.get(
-                OPENMETEO_ARCHIVE_URL,
-                params=params,
-                timeout=self.timeout
+        if any(result is None for result in chunk_results):
+            logger.error(
+                f"Error fetching historical weather for ({latitude}, {longitude}) "
+                f"{start_date} - {end_date}: incomplete data"
             )
-            response.raise_for_status()
+            return None
 
-            data = response.json()
-            if data.get('daily'):
-                return self._parse_daily_forecast(data['daily'])
+        return list(chain.from_iterable(chunk_results))
 
-        except Exception as e:
-            logger.error(f"Error fetching historical weather for ({latitude}, {longitude}): {str(e)}")
+    @staticmethod
+    def _split_date_range(start_date: str, end_date: str, days: int) -> List[Tuple[str, str]]:
+        """Split an inclusive YYYY-MM-DD range into consecutive windows of at most `days` days."""
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
 
-        return None
+        chunks = []
+        while start <= end:
+            chunk_end = min(start + timedelta(days=days - 1), end)
+            chunks.append((start.isoformat(), chunk_end.isoformat()))
+            start = chunk_end + timedelta(days=1)
+
+        return chunks
+
+    def _fetch_historical_chunk(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str
+    ) -> Optional[List[Dict]]:
+        """Fetch (or read from cache) historical weather for one date window."""
+        cache_key = f"weather:historical:{latitude}:{longitude}:{start_date}:{end_date}"
+
+        def _fetch() -> Optional[List[Dict]]:
+            try:
+                params = {
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'daily': [
+                        'temperature_2m_max',
+                        'temperature_2m_min',
+                        'precipitation_sum',
+                        'weather_code'
+                    ],
+                    'timezone': 'Asia/Kolkata'
+                }
+
+                response = self._get(OPENMETEO_ARCHIVE_URL, params)
+                response.raise_for_status()
+
+                data = orjson.loads(response.content)
+                if data.get('daily'):
+                    return self._parse_daily_forecast(data['daily'])
+
+            except Exception as e:
+                logger.error(f"Error fetching historical weather for ({latitude}, {longitude}): {str(e)}")
+
+            return None
+
+        settled_before = timezone.now().date() - timedelta(days=HISTORICAL_SETTLED_DAYS)
+        if date.fromisoformat(end_date) <= settled_before:
+            # Settled past weather doesn't change, so cache forever
+            cache_timeout = CACHE_TTLS['weather_historical']
+        else:
+            cache_timeout = CACHE_TTLS['weather_forecast']
+
+        return get_or_fetch_cached(cache_key, _fetch, cache_timeout)
 
     def collect_for_location(self, location_name: str) -> Optional[Dict]:
         """
@@ -293,23 +535,58 @@ class WeatherDataCollector:
     def collect_for_default_locations(self) -> Dict[str, Optional[Dict]]:
         """
         Collect weather for all default Indian cities.
+        Current weather and forecasts for all cities are fetched with one
+        batched call each, using the cities' fixed coordinates; the two calls
+        run concurrently.
 
         Returns:
             Dictionary mapping city names to weather data
         """
-        results = {}
-
-        for location_name in DEFAULT_LOCATIONS.keys():
-            logger.info(f"Collecting weather for {location_name}")
-            weather_data = self.collect_for_location(location_name)
-            results[location_name] = weather_data
-
-            # Rate limiting: small delay between requests
-            import time
-            time.sleep(1)
+        location_names = list(DEFAULT_LOCATIONS.keys())
+        results = dict.fromkeys(location_names)
+
+        locations = {location_name: self.geocode_location(location_name) for location_name in location_names}
+
+        geocoded = []
+        for location_name, location in locations.items():
+            if location:
+                geocoded.append(location_name)
+            else:
+                logger.warning(f"Could not geocode location: {location_name}")
+
+        if not geocoded:
+            return results
+
+        logger.info(f"Collecting weather for {', '.join(geocoded)}")
+        coords = [
+            (locations[location_name]['latitude'], locations[location_name]['longitude'])
+            for location_name in geocoded
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            current_future = executor.submit(self.fetch_current_weather_batch, coords)
+            forecast_future = executor.submit(self.fetch_forecast_batch, coords, days=7)
+            current_batch = current_future.result()
+            forecast_batch = forecast_future.result()
+        collected_at = timezone.now().isoformat()
+
+        for location_name, current, forecast in zip(geocoded, current_batch, forecast_batch):
+            if current or forecast:
+                results[location_name] = {
+                    'location': locations[location_name],
+                    'current': current,
+                    'forecast': forecast,
+                    'collected_at': collected_at
+                }
 
         return results
 
+    @staticmethod
+    def _describe_weather_code(weather_code) -> str:
+        """Human-readable description for a WMO weather code."""
+        if isinstance(weather_code, int) and 0 <= weather_code < len(WEATHER_CODES_LUT):
+            return WEATHER_CODES_LUT[weather_code]
+        return 'Unknown'
+
     def _parse_weather_data(self, current: Dict) -> Dict:
         """Parse current weather API response."""
         weather_code = current.get('weather_code', 0)
@@ -320,7 +597,7 @@ class WeatherDataCollector:
             'humidity': current.get('relative_humidity_2m'),
             'precipitation': current.get('precipitation'),
             'weather_code': weather_code,
-            'weather_description': WEATHER_CODES.get(weather_code, 'Unknown'),
+            'weather_description': self._describe_weather_code(weather_code),
             'wind_speed': current.get('wind_speed_10m'),
             'wind_direction': current.get('wind_direction_10m'),
             'timestamp': current.get('time')
@@ -328,38 +605,45 @@ class WeatherDataCollector:
 
     def _parse_daily_forecast(self, daily: Dict) -> List[Dict]:
         """Parse daily forecast API response."""
-        forecasts = []
         times = daily.get('time', [])
-        temps_max = daily.get('temperature_2m_max', [])
-        temps_min = daily.get('temperature_2m_min', [])
-        precip = daily.get('precipitation_sum', [])
-        weather_codes = daily.get('weather_code', [])
-        wind_speeds = daily.get('wind_speed_10m_max', [])
-
-        for i in range(len(times)):
-            weather_code = weather_codes[i] if i < len(weather_codes) else 0
-
-            forecast_item = {
-                'date': times[i],
-                'temperature_max': temps_max[i] if i < len(temps_max) else None,
-                'temperature_min': temps_min[i] if i < len(temps_min) else None,
-                'precipitation': precip[i] if i < len(precip) else None,
+        n = len(times)
+
+        def _aligned(values: List, fill=None) -> List:
+            # Pad/trim each series to one value per day
+            return (list(values) + [fill] * n)[:n]
+
+        temps_max = _aligned(daily.get('temperature_2m_max', []))
+        temps_min = _aligned(daily.get('temperature_2m_min', []))
+        precip = _aligned(daily.get('precipitation_sum', []))
+        weather_codes = _aligned(daily.get('weather_code', []), fill=0)
+        wind_speeds = _aligned(daily.get('wind_speed_10m_max', []))
+        temps_avg = [
+            (temp_max + temp_min) / 2 if temp_max is not None and temp_min is not None else None
+            for temp_max, temp_min in zip(temps_max, temps_min)
+        ]
+
+        return [
+            {
+                'date': day,
+                'temperature_max': temp_max,
+                'temperature_min': temp_min,
+                'precipitation': precipitation,
                 'weather_code': weather_code,
-                'weather_description': WEATHER_CODES.get(weather_code, 'Unknown'),
-                'wind_speed_max': wind_speeds[i] if i < len(wind_speeds) else None,
-                'temperature_avg': (
-                    (temps_max[i] + temps_min[i]) / 2
-                    if i < len(temps_max) and i < len(temps_min)
-                    else None
-                )
+                'weather_description': self._describe_weather_code(weather_code),
+                'wind_speed_max': wind_speed,
+                'temperature_avg': temp_avg
             }
-            forecasts.append(forecast_item)
-
-        return forecasts
+            for day, temp_max, temp_min, precipitation, weather_code, wind_speed, temp_avg in zip(
+                times, temps_max, temps_min, precip, weather_codes, wind_speeds, temps_avg
+            )
+        ]
 
     def close(self):
-        """Close HTTP session."""
-        self.session.close()
+        """
+        Release the collector. The HTTP session is shared across collectors,
+        so it is left open for reuse.
+        """
+        pass
 
     def __enter__(self):
         """Context manager entry."""
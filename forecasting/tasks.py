@@ -1,16 +1,77 @@
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
 from django.db import transaction
+from datetime import date
 import logging
-import time
 
 from forecasting.models import ExternalDataSource
+from forecasting.services.feature_engineering import FeatureEngineer
 from forecasting.services.weather_service import WeatherDataCollector, DEFAULT_LOCATIONS
 from forecasting.services.trends_service import GoogleTrendsCollector, DEFAULT_KEYWORDS
 from forecasting.utils.data_loaders import load_festival_calendar
 
 logger = logging.getLogger(__name__)
 
+BULK_BATCH_SIZE = 500
+
+
+def _bulk_upsert(model, rows, key_fields, update_fields):
+    """
+    Create or update many rows in a handful of queries (bulk update_or_create).
+    Existing rows are matched on key_fields with one SELECT, then updated with
+    bulk_update; the rest are inserted with bulk_create, all in one transaction.
+    Later rows win when several share a key.
+
+    Args:
+        model: Django model class
+        rows: List of dicts of field values (key_fields + update_fields)
+        key_fields: Fields identifying a row (like update_or_create kwargs)
+        update_fields: Fields to set on existing rows (like defaults)
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    rows_by_key = {tuple(row[field] for field in key_fields): row for row in rows}
+
+    # Keep auto_now timestamps current, as save() would
+    update_fields = list(update_fields) + [
+        field.name for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) and field.name not in update_fields
+    ]
+    now = timezone.now()
+
+    with transaction.atomic():
+        candidates = model.objects.filter(**{
+            f'{field}__in': {key[i] for key in rows_by_key}
+            for i, field in enumerate(key_fields)
+        })
+        existing = {
+            tuple(getattr(obj, field) for field in key_fields): obj
+            for obj in candidates
+        }
+
+        to_update = []
+        to_create = []
+        for key, row in rows_by_key.items():
+            obj = existing.get(key)
+            if obj is None:
+                to_create.append(model(**row))
+                continue
+
+            for field in update_fields:
+                setattr(obj, field, row[field] if field in row else now)
+            to_update.append(obj)
+
+        if to_update:
+            model.objects.bulk_update(to_update, update_fields, batch_size=BULK_BATCH_SIZE)
+        if to_create:
+            model.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+
+    return len(rows_by_key)
+
 
 # ==================== Data Collection Tasks ====================
 
@@ -28,6 +89,8 @@ def collect_weather_data(self):
 
         collected_count = 0
         failed_count = 0
+        today = timezone.now().date()
+        rows = []
 
         for location_name, location_data in weather_data.items():
             if not location_data:
@@ -36,44 +99,47 @@ def collect_weather_data(self):
                 continue
 
             try:
-                location_info = location_data['location']
                 current = location_data.get('current')
                 forecast = location_data.get('forecast')
 
-                # Store current weather
+                # Current weather
                 if current:
-                    ExternalDataSource.objects.update_or_create(
-                        data_type='weather',
-                        location_code=location_name,
-                        data_date=timezone.now().date(),
-                        defaults={
-                            'value': current.get('temperature'),
-                            'raw_data': current,
-                            'source': 'open-meteo'
-                        }
-                    )
+                    rows.append({
+                        'data_type': 'weather',
+                        'location_code': location_name,
+                        'data_date': today,
+                        'value': current.get('temperature'),
+                        'raw_data': current,
+                        'source': 'open-meteo'
+                    })
                     collected_count += 1
 
-                # Store forecast data
+                # Forecast data
                 if forecast:
                     for day_forecast in forecast[:7]:  # Store 7-day forecast
                         forecast_date = day_forecast.get('date')
                         if forecast_date:
-                            ExternalDataSource.objects.update_or_create(
-                                data_type='weather_forecast',
-                                location_code=location_name,
-                                data_date=forecast_date,
-                                defaults={
-                                    'value': day_forecast.get('temperature_avg'),
-                                    'raw_data': day_forecast,
-                                    'source': 'open-meteo'
-                                }
-                            )
+                            rows.append({
+                                'data_type': 'weather_forecast',
+                                'location_code': location_name,
+                                'data_date': date.fromisoformat(forecast_date),
+                                'value': day_forecast.get('temperature_avg'),
+                                'raw_data': day_forecast,
+                                'source': 'open-meteo'
+                            })
 
             except Exception as e:
                 logger.error(f"Error storing weather data for {location_name}: {str(e)}")
                 failed_count += 1
 
+        _bulk_upsert(
+            ExternalDataSource,
+            rows,
+            key_fields=('data_type', 'location_code', 'data_date'),
+            update_fields=('value', 'raw_data', 'source')
+        )
+
+        FeatureEngineer.invalidate_feature_cache()
         logger.info(f"Weather collection completed: {collected_count} successful, {failed_count} failed")
         return {
             'status': 'success',
@@ -93,7 +159,7 @@ def collect_trends_data(self):
     """
     Collect Google Trends data using pytrends (FREE)
     Scheduled: Weekly on Sunday at 7 AM
-    Rate limiting: 5+ second delays between requests to avoid throttling
+    Rate limiting: GoogleTrendsCollector spaces out the pytrends requests themselves
     """
     try:
         logger.info("Starting Google Trends data collection...")
@@ -101,8 +167,9 @@ def collect_trends_data(self):
         collector = GoogleTrendsCollector()
         category_trends = collector.collect_default_categories(timeframe='today 3-m')
 
-        stored_count = 0
         failed_count = 0
+        today = timezone.now().date()
+        rows = []
 
         for category, trends_data in category_trends.items():
             if not trends_data:
@@ -110,28 +177,25 @@ def collect_trends_data(self):
                 failed_count += 1
                 continue
 
-            try:
-                # Store trends data
-                ExternalDataSource.objects.update_or_create(
-                    data_type='trends',
-                    product_code=category,
-                    data_date=timezone.now().date(),
-                    location_code='IN',  # India
-                    defaults={
-                        'value': trends_data.get('data', {}).get('score', 50),
-                        'raw_data': trends_data,
-                        'source': 'google-trends'
-                    }
-                )
-                stored_count += 1
-
-            except Exception as e:
-                logger.error(f"Error storing trends data for {category}: {str(e)}")
-                failed_count += 1
-
-            # Rate limiting: delay between requests
-            time.sleep(2)
+            rows.append({
+                'data_type': 'trends',
+                'product_code': category,
+                'data_date': today,
+                'location_code': 'IN',  # India
+                'value': trends_data.get('data', {}).get('score', 50),
+                'raw_data': trends_data,
+                'source': 'google-trends'
+            })
+
+        # Store trends data
+        stored_count = _bulk_upsert(
+            ExternalDataSource,
+            rows,
+            key_fields=('data_type', 'product_code', 'data_date', 'location_code'),
+            update_fields=('value', 'raw_data', 'source')
+        )
 
+        FeatureEngineer.invalidate_feature_cache()
         logger.info(f"Trends collection completed: {stored_count} successful, {failed_count} failed")
         return {
             'status': 'success',
@@ -155,31 +219,36 @@ def update_festival_calendar(self):
         logger.info("Starting festival calendar update...")
 
         festivals_data = load_festival_calendar(use_cache=False)
-        updated_count = 0
+        current_year = timezone.now().year
+        rows = []
 
         for festival in festivals_data.get('festivals', []):
             try:
                 # Get this year and next year
-                for year in [timezone.now().year, timezone.now().year + 1]:
+                for year in [current_year, current_year + 1]:
                     festival_date_str = festival.get('dates', {}).get(str(year))
 
                     if festival_date_str:
-                        ExternalDataSource.objects.update_or_create(
-                            data_type='festival',
-                            product_code=festival.get('name'),
-                            data_date=festival_date_str,
-                            location_code=festival.get('region', 'pan-india'),
-                            defaults={
-                                'value': festival.get('demand_multiplier', 1.0),
-                                'raw_data': festival,
-                                'source': 'static-data'
-                            }
-                        )
-                        updated_count += 1
+                        rows.append({
+                            'data_type': 'festival',
+                            'product_code': festival.get('name'),
+                            'data_date': date.fromisoformat(festival_date_str),
+                            'location_code': festival.get('region', 'pan-india'),
+                            'value': festival.get('demand_multiplier', 1.0),
+                            'raw_data': festival,
+                            'source': 'static-data'
+                        })
 
             except Exception as e:
                 logger.error(f"Error updating festival {festival.get('name')}: {str(e)}")
 
+        updated_count = _bulk_upsert(
+            ExternalDataSource,
+            rows,
+            key_fields=('data_type', 'product_code', 'data_date', 'location_code'),
+            update_fields=('value', 'raw_data', 'source')
+        )
+
         logger.info(f"Festival calendar update completed: {updated_count} records updated")
         return {
             'status': 'success',
@@ -228,35 +297,27 @@ def generate_forecasts(self):
     """
     Generate demand forecasts for all SKUs using PredictionService
     Scheduled: Daily at 2 AM
+    Fans out one generate_forecast_for_sku task per SKU so workers run them
+    in parallel; summarize_forecast_generation logs the totals.
     """
     try:
         logger.info("Starting forecast generation for all SKUs...")
 
         from variant.models import ProductVariant
-        from forecasting.services.prediction_service import PredictionService
 
         # Get all active SKUs
         skus = ProductVariant.objects.filter(
             product__is_active=True
         ).values_list('sku', flat=True)[:1000]  # Limit to 1000 per run
 
-        forecast_count = 0
-        error_count = 0
+        header = [generate_forecast_for_sku.s(sku) for sku in skus.iterator(chunk_size=500)]
+        if header:
+            chord(header)(summarize_forecast_generation.s())
 
-        for sku in skus:
-            try:
-                forecast = PredictionService.get_demand_forecast(sku, days_ahead=30)
-                if forecast:
-                    forecast_count += 1
-            except Exception as e:
-                logger.warning(f"Error generating forecast for {sku}: {str(e)}")
-                error_count += 1
-
-        logger.info(f"Forecast generation completed: {forecast_count} successful, {error_count} failed")
+        logger.info(f"Forecast generation dispatched for {len(header)} SKUs")
         return {
             'status': 'success',
-            'forecasts_generated': forecast_count,
-            'errors': error_count,
+            'forecasts_dispatched': len(header),
             'timestamp': timezone.now().isoformat()
         }
 
@@ -274,61 +335,67 @@ def calculate_accuracy(self):
     try:
         logger.info("Starting accuracy calculation...")
 
-        from forecasting.models import DemandForecast, ForecastAccuracy, HistoricalSalesDaily
+        from forecasting.models import DemandForecast, ForecastAccuracy
         from datetime import timedelta
+        from django.db.models import Case, F, FloatField, Value, When
+        from django.db.models.functions import Abs, Cast, Power
 
-        # Find forecasts from yesterday
+        # Find forecasts from yesterday, with error metrics computed in the query
         yesterday = timezone.now().date() - timedelta(days=1)
+        error = F('actual_quantity') - F('predicted_quantity')
+        # model_version may be a relation; read and write it by column
+        model_version = ForecastAccuracy._meta.get_field('model_version').attname
+        forecast_model_version = DemandForecast._meta.get_field('model_version').attname
         forecasts = DemandForecast.objects.filter(
             forecast_date=yesterday,
             actual_quantity__isnull=False
+        ).annotate(
+            error_absolute=Abs(error),
+            error_percentage=Case(
+                When(predicted_quantity=0, then=Value(100.0)),
+                default=Cast(Abs(error), FloatField()) * 100 / F('predicted_quantity'),
+                output_field=FloatField()
+            ),
+            error_squared=Power(error, 2)
+        ).values(
+            'product_variant_id', 'sku_code', 'forecast_date', 'days_ahead',
+            'predicted_quantity', 'actual_quantity', 'model_type',
+            'error_absolute', 'error_percentage', 'error_squared', forecast_model_version
         )
 
-        accuracy_count = 0
-        error_count = 0
-
-        for forecast in forecasts[:1000]:
-            try:
-                # Calculate error metrics
-                predicted = forecast.predicted_quantity
-                actual = forecast.actual_quantity
-
-                if predicted == 0:
-                    percentage_error = 100
-                else:
-                    percentage_error = abs(actual - predicted) / predicted * 100
-
-                absolute_error = abs(actual - predicted)
-                squared_error = (actual - predicted) ** 2
-
-                # Store accuracy metrics
-                ForecastAccuracy.objects.update_or_create(
-                    product_variant=forecast.product_variant,
-                    sku_code=forecast.sku_code,
-                    metric_date=yesterday,
-                    forecast_date=forecast.forecast_date,
-                    days_ahead=forecast.days_ahead,
-                    defaults={
-                        'predicted_quantity': predicted,
-                        'actual_quantity': actual,
-                        'absolute_error': absolute_error,
-                        'percentage_error': percentage_error,
-                        'squared_error': squared_error,
-                        'model_version': forecast.model_version,
-                        'model_type': forecast.model_type
-                    }
-                )
-                accuracy_count += 1
-
-            except Exception as e:
-                logger.warning(f"Error calculating accuracy for forecast {forecast.id}: {str(e)}")
-                error_count += 1
+        rows = [
+            {
+                'product_variant_id': forecast['product_variant_id'],
+                'sku_code': forecast['sku_code'],
+                'metric_date': yesterday,
+                'forecast_date': forecast['forecast_date'],
+                'days_ahead': forecast['days_ahead'],
+                'predicted_quantity': forecast['predicted_quantity'],
+                'actual_quantity': forecast['actual_quantity'],
+                'absolute_error': forecast['error_absolute'],
+                'percentage_error': forecast['error_percentage'],
+                'squared_error': forecast['error_squared'],
+                model_version: forecast[forecast_model_version],
+                'model_type': forecast['model_type']
+            }
+            for forecast in forecasts[:1000]
+        ]
+
+        # Store accuracy metrics
+        accuracy_count = _bulk_upsert(
+            ForecastAccuracy,
+            rows,
+            key_fields=('product_variant_id', 'sku_code', 'metric_date', 'forecast_date', 'days_ahead'),
+            update_fields=(
+                'predicted_quantity', 'actual_quantity', 'absolute_error', 'percentage_error',
+                'squared_error', model_version, 'model_type'
+            )
+        )
 
-        logger.info(f"Accuracy calculation completed: {accuracy_count} records, {error_count} errors")
+        logger.info(f"Accuracy calculation completed: {accuracy_count} records")
         return {
             'status': 'success',
             'accuracy_records': accuracy_count,
-            'errors': error_count,
             'timestamp': timezone.now().isoformat()
         }
 
@@ -350,25 +417,30 @@ def generate_alerts(self):
         from forecasting.services.prediction_service import PredictionService
         from forecasting.models import InventoryAlert
 
-        # Get all active products
-        variants = ProductVariant.objects.filter(product__is_active=True)[:500]
+        # Get all active products (only the fields the alerts need)
+        variants = list(
+            ProductVariant.objects.filter(product__is_active=True).only('id', 'sku')[:500]
+        )
+
+        # Forecasts for the whole batch up front (batched cache and stock/baseline queries)
+        forecasts = PredictionService.get_demand_forecast_bulk(
+            [variant.sku for variant in variants],
+            days_ahead=14
+        )
 
-        alert_count = 0
         error_count = 0
+        rows = []
 
         for variant in variants:
             try:
-                # Get forecast
-                forecast = PredictionService.get_demand_forecast(variant.sku, days_ahead=14)
+                forecast = forecasts.get(variant.sku)
 
                 if not forecast:
                     continue
 
                 current_stock = forecast.get('current_stock', 0)
                 days_until_stockout = forecast.get('days_until_stockout', 999)
-                next_7d_demand = sum(
-                    f['predicted_quantity'] for f in forecast['forecasts'][:7]
-                )
+                next_7d_demand = float(forecast['predicted_qty_array'][:7].sum())
 
                 # Determine alert type and severity
                 alert_type = None
@@ -385,25 +457,33 @@ def generate_alerts(self):
                     severity = 'info'
 
                 if alert_type:
-                    alert, created = InventoryAlert.objects.update_or_create(
-                        product_variant=variant,
-                        sku_code=variant.sku,
-                        defaults={
-                            'alert_type': alert_type,
-                            'severity': severity,
-                            'status': 'active',
-                            'current_stock': current_stock,
-                            'predicted_daily_demand': next_7d_demand / 7,
-                            'days_until_stockout': days_until_stockout,
-                            'recommended_reorder_quantity': int(next_7d_demand * 1.5)
-                        }
-                    )
-                    alert_count += 1
+                    rows.append({
+                        'product_variant_id': variant.id,
+                        'sku_code': variant.sku,
+                        'alert_type': alert_type,
+                        'severity': severity,
+                        'status': 'active',
+                        'current_stock': current_stock,
+                        'predicted_daily_demand': next_7d_demand / 7,
+                        'days_until_stockout': days_until_stockout,
+                        'recommended_reorder_quantity': int(next_7d_demand * 1.5)
+                    })
 
             except Exception as e:
                 logger.warning(f"Error generating alerts for {variant.sku}: {str(e)}")
                 error_count += 1
 
+        alert_count = _bulk_upsert(
+            InventoryAlert,
+            rows,
+            key_fields=('product_variant_id', 'sku_code'),
+            update_fields=(
+                'alert_type', 'severity', 'status', 'current_stock',
+                'predicted_daily_demand', 'days_until_stockout',
+                'recommended_reorder_quantity'
+            )
+        )
+
         logger.info(f"Alert generation completed: {alert_count} alerts, {error_count} errors")
         return {
             'status': 'success',
@@ -454,6 +534,79 @@ def generate_forecast_for_sku(sku_code):
         }
 
 
+@shared_task
+def summarize_forecast_generation(results):
+    """
+    Log totals for a generate_forecasts run
+    Triggered: Chord callback once every per-SKU forecast task has finished
+    """
+    forecast_count = sum(1 for result in results if result and result.get('status') == 'success')
+    error_count = len(results) - forecast_count
+
+    logger.info(f"Forecast generation completed: {forecast_count} successful, {error_count} failed")
+    return {
+        'status': 'success',
+        'forecasts_generated': forecast_count,
+        'errors': error_count,
+        'timestamp': timezone.now().isoformat()
+    }
+
+
+@shared_task
+def refresh_demand_forecast(sku_code, days_ahead=7):
+    """
+    Recompute a stale cached forecast for a SKU
+    Triggered: When a cached forecast is served past its fresh period
+    """
+    try:
+        from forecasting.services.prediction_service import PredictionService
+
+        result = PredictionService.refresh_demand_forecast(sku_code, days_ahead)
+        if result is None:
+            return {
+                'status': 'error',
+                'sku': sku_code,
+                'message': 'Forecast generation failed; keeping cached forecast'
+            }
+
+        return {
+            'status': 'success',
+            'sku': sku_code,
+            'days_ahead': days_ahead
+        }
+
+    except Exception as exc:
+        logger.error(f"Error refreshing forecast for {sku_code}: {exc}")
+        return {
+            'status': 'error',
+            'sku': sku_code,
+            'message': str(exc)
+        }
+
+
+@shared_task
+def invalidate_feature_cache():
+    """
+    Drop all cached feature sets
+    Triggered: By kidbea_wh after it ingests HistoricalSalesDaily rows
+    (e.g. send_task('forecasting.tasks.invalidate_feature_cache')); without it,
+    cached features lag new sales by up to FEATURES_CACHE_TIMEOUT
+    """
+    try:
+        FeatureEngineer.invalidate_feature_cache()
+        return {
+            'status': 'success',
+            'timestamp': timezone.now().isoformat()
+        }
+
+    except Exception as exc:
+        logger.error(f"Error invalidating feature cache: {exc}")
+        return {
+            'status': 'error',
+            'message': str(exc)
+        }
+
+
 @shared_task
 def retrain_model(model_type=None):
     """
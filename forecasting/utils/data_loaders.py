@@ -3,11 +3,20 @@ Utilities for loading and caching external data sources.
 Handles festival calendars, seasonal patterns, and static data files.
 """
 
+import copy
 import json
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+import numpy as np
+import orjson
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from django.core.cache import cache
 from django.utils import timezone
 
@@ -17,6 +26,24 @@ class DataLoaderException(Exception):
     pass
 
 
+# Season name by month, indexed by month - 1
+MONTH_TO_SEASON = (
+    'winter', 'winter',
+    'summer', 'summer', 'summer', 'summer',
+    'monsoon', 'monsoon', 'monsoon',
+    'spring',
+    'winter', 'winter'
+)
+
+
+# Temperature impact buckets: upper bounds (exclusive, in Celsius) and their keys
+TEMPERATURE_BINS = (10, 15, 20, 25, 30, 35, 40)
+TEMPERATURE_BUCKETS = (
+    'below_10', '10_to_15', '15_to_20', '20_to_25',
+    '25_to_30', '30_to_35', '35_to_40', 'above_40'
+)
+
+
 def get_static_data_path(filename: str) -> Optional[Path]:
     """
     Get absolute path to a static data JSON file.
@@ -35,6 +62,7 @@ def load_json_file(filename: str, default: Optional[Dict] = None) -> Dict[str, A
     """
     Load and parse a JSON static data file.
     Returns default dict if file missing or invalid, never raises exceptions.
+    The parsed data is the caller's own copy and may be mutated.
 
     Args:
         filename: JSON filename to load
@@ -51,15 +79,121 @@ def load_json_file(filename: str, default: Optional[Dict] = None) -> Dict[str, A
         if not filepath:
             return default
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data if data else default
-    except json.JSONDecodeError:
+        data = _parse_json_file(str(filepath), filepath.stat().st_mtime_ns)
+        return copy.deepcopy(data) if data else default
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
         return default
     except Exception:
         return default
 
 
+@lru_cache(maxsize=8)
+def _parse_json_file(filepath: str, mtime_ns: int) -> Any:
+    """
+    Parse a JSON file, memoized per process by path and modification time.
+    The result is shared between callers, so it must not be mutated.
+    """
+    with open(filepath, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+FESTIVAL_CACHE_KEY = "forecasting:festivals:calendar"
+SEASONAL_CACHE_KEY = "forecasting:seasonal:patterns"
+STATIC_DATA_CACHE_TIMEOUT = 86400  # 24 hours
+STATIC_DATA_FILES = ("indian_festivals.json", "seasonal_patterns.json")
+STATIC_DATA_RECHECK_SECONDS = 60  # How often each process re-checks the files for edits
+
+_static_data_state = {'checked_at': None, 'mtimes': None}
+_static_data_lock = threading.Lock()
+
+
+def load_all_static_data(use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Load festival calendar and seasonal patterns together.
+    Uses a single cache round-trip for both keys and writes back any misses in one call.
+
+    Args:
+        use_cache: Whether to use cached data (default: True)
+
+    Returns:
+        Dictionary with 'festivals' and 'seasonal_patterns' (guaranteed valid)
+    """
+    if not use_cache:
+        return {
+            'festivals': _read_festival_calendar(),
+            'seasonal_patterns': _read_seasonal_patterns(),
+        }
+
+    cached = cache.get_many([FESTIVAL_CACHE_KEY, SEASONAL_CACHE_KEY])
+    festivals_data = cached.get(FESTIVAL_CACHE_KEY)
+    seasonal_data = cached.get(SEASONAL_CACHE_KEY)
+
+    misses = {}
+    if not festivals_data:
+        festivals_data = _read_festival_calendar()
+        misses[FESTIVAL_CACHE_KEY] = festivals_data
+    if not seasonal_data:
+        seasonal_data = _read_seasonal_patterns()
+        misses[SEASONAL_CACHE_KEY] = seasonal_data
+
+    if misses:
+        cache.set_many(misses, STATIC_DATA_CACHE_TIMEOUT)
+
+    return {
+        'festivals': festivals_data,
+        'seasonal_patterns': seasonal_data,
+    }
+
+
+def get_static_data_version() -> Tuple[Tuple[Optional[int], ...], int]:
+    """
+    Token identifying the static data in effect, for keying in-process memos.
+    Combines the JSON files' modification times with the current
+    STATIC_DATA_CACHE_TIMEOUT period, so memos reload when a file is edited
+    and at least once per cache TTL. Files are re-checked at most every
+    STATIC_DATA_RECHECK_SECONDS; when they change, the shared cache copies
+    are dropped so the reload reads the files.
+    """
+    now = time.monotonic()
+    checked_at = _static_data_state['checked_at']
+    if checked_at is None or now - checked_at >= STATIC_DATA_RECHECK_SECONDS:
+        with _static_data_lock:
+            checked_at = _static_data_state['checked_at']
+            if checked_at is None or now - checked_at >= STATIC_DATA_RECHECK_SECONDS:
+                mtimes = _get_static_data_mtimes()
+                previous = _static_data_state['mtimes']
+                if previous is not None and mtimes != previous:
+                    try:
+                        cache.delete_many([FESTIVAL_CACHE_KEY, SEASONAL_CACHE_KEY])
+                    except Exception:
+                        pass
+                _static_data_state['mtimes'] = mtimes
+                _static_data_state['checked_at'] = now
+
+    return _static_data_state['mtimes'], int(time.time() // STATIC_DATA_CACHE_TIMEOUT)
+
+
+def _get_static_data_mtimes() -> Tuple[Optional[int], ...]:
+    """Modification times of the static data files (None for a missing file)."""
+    mtimes = []
+    for filename in STATIC_DATA_FILES:
+        try:
+            filepath = get_static_data_path(filename)
+            mtimes.append(filepath.stat().st_mtime_ns if filepath else None)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+@lru_cache(maxsize=1)
+def _load_all_static_data_memoized(version: Tuple) -> Dict[str, Dict[str, Any]]:
+    """
+    Static data kept in-process, so hot paths skip the shared-cache round-trip.
+    version (from get_static_data_version) only keys the memo.
+    """
+    return load_all_static_data(use_cache=True)
+
+
 def load_festival_calendar(use_cache: bool = True) -> Dict[str, Any]:
     """
     Load and cache Indian festival calendar.
@@ -71,13 +205,18 @@ def load_festival_calendar(use_cache: bool = True) -> Dict[str, Any]:
     Returns:
         Dictionary with festival data (guaranteed valid)
     """
-    cache_key = "forecasting:festivals:calendar"
-
     if use_cache:
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
+        return copy.deepcopy(_festival_calendar())
+    return _read_festival_calendar()
+
 
+def _festival_calendar() -> Dict[str, Any]:
+    """Festival calendar shared in-process by this module's helpers; must not be mutated."""
+    return _load_all_static_data_memoized(get_static_data_version())['festivals']
+
+
+def _read_festival_calendar() -> Dict[str, Any]:
+    """Read the festival calendar file, falling back to a minimal default."""
     # Default structure if file missing
     default_festivals = {
         'festivals': [
@@ -93,13 +232,7 @@ def load_festival_calendar(use_cache: bool = True) -> Dict[str, Any]:
         ]
     }
 
-    festivals_data = load_json_file("indian_festivals.json", default=default_festivals)
-
-    # Cache for 24 hours
-    if use_cache:
-        cache.set(cache_key, festivals_data, 86400)
-
-    return festivals_data
+    return load_json_file("indian_festivals.json", default=default_festivals)
 
 
 def load_seasonal_patterns(use_cache: bool = True) -> Dict[str, Any]:
@@ -113,13 +246,18 @@ def load_seasonal_patterns(use_cache: bool = True) -> Dict[str, Any]:
     Returns:
         Dictionary with seasonal data (guaranteed valid)
     """
-    cache_key = "forecasting:seasonal:patterns"
-
     if use_cache:
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
+        return copy.deepcopy(_seasonal_patterns())
+    return _read_seasonal_patterns()
+
 
+def _seasonal_patterns() -> Dict[str, Any]:
+    """Seasonal patterns shared in-process by this module's helpers; must not be mutated."""
+    return _load_all_static_data_memoized(get_static_data_version())['seasonal_patterns']
+
+
+def _read_seasonal_patterns() -> Dict[str, Any]:
+    """Read the seasonal patterns file, falling back to a minimal default."""
     # Default structure if file missing
     default_patterns = {
         'seasons': {
@@ -143,13 +281,7 @@ def load_seasonal_patterns(use_cache: bool = True) -> Dict[str, Any]:
         }
     }
 
-    seasonal_data = load_json_file("seasonal_patterns.json", default=default_patterns)
-
-    # Cache for 24 hours
-    if use_cache:
-        cache.set(cache_key, seasonal_data, 86400)
-
-    return seasonal_data
+    return load_json_file("seasonal_patterns.json", default=default_patterns)
 
 
 def get_festivals_in_range(start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
@@ -165,38 +297,44 @@ def get_festivals_in_range(start_date: datetime, end_date: datetime) -> List[Dic
         List of festival dictionaries (guaranteed)
     """
     try:
-        festivals_data = load_festival_calendar()
-        matching_festivals = []
+        dates, festivals = _get_festival_date_index(get_static_data_version())
+        first = bisect_left(dates, start_date.date())
+        last = bisect_right(dates, end_date.date())
 
-        current_year = start_date.year
-        end_year = end_date.year
-
-        for festival in festivals_data.get('festivals', []):
-            festival_dates = festival.get('dates', {})
-
-            for year in range(current_year, end_year + 1):
-                year_str = str(year)
-                if year_str in festival_dates:
-                    try:
-                        festival_date_str = festival_dates[year_str]
-                        festival_date = datetime.strptime(festival_date_str, '%Y-%m-%d').date()
-
-                        if start_date.date() <= festival_date <= end_date.date():
-                            festival_info = festival.copy()
-                            festival_info['festival_date'] = festival_date.isoformat()
-                            festival_info['days_until'] = (festival_date - start_date.date()).days
-                            matching_festivals.append(festival_info)
-                    except:
-                        continue
-
-        # Sort by date
-        matching_festivals.sort(key=lambda x: x.get('festival_date', ''))
+        matching_festivals = []
+        for festival_date, festival in zip(dates[first:last], festivals[first:last]):
+            festival_info = copy.deepcopy(festival)
+            festival_info['festival_date'] = festival_date.isoformat()
+            festival_info['days_until'] = (festival_date - start_date.date()).days
+            matching_festivals.append(festival_info)
 
         return matching_festivals
     except:
         return []
 
 
+@lru_cache(maxsize=1)
+def _get_festival_date_index(version: Tuple) -> Tuple[Tuple[date, ...], Tuple[Dict[str, Any], ...]]:
+    """
+    Every (date, festival) occurrence in the calendar, with dates parsed once and
+    sorted, as parallel tuples so date ranges can be sliced with bisect.
+    Memoized per static data version.
+    """
+    occurrences = []
+    for festival in _festival_calendar().get('festivals', []):
+        for festival_date_str in festival.get('dates', {}).values():
+            try:
+                occurrences.append((date.fromisoformat(festival_date_str), festival))
+            except (TypeError, ValueError):
+                continue
+
+    occurrences.sort(key=itemgetter(0))
+    return (
+        tuple(festival_date for festival_date, _ in occurrences),
+        tuple(festival for _, festival in occurrences)
+    )
+
+
 def get_upcoming_festivals(days_ahead: int = 30) -> List[Dict[str, Any]]:
     """
     Get upcoming festivals within next N days.
@@ -224,15 +362,10 @@ def get_seasonal_multiplier(category: str, month: int) -> float:
     Returns:
         Demand multiplier (1.0 = baseline)
     """
-    seasonal_data = load_seasonal_patterns()
+    seasonal_data = _seasonal_patterns()
 
     # Determine season from month
-    season = None
-    for season_name, season_info in seasonal_data.get('seasons', {}).items():
-        if month in season_info.get('months', []):
-            season = season_name
-            break
-
+    season = _get_month_to_season(get_static_data_version()).get(month)
     if not season:
         return 1.0
 
@@ -243,6 +376,17 @@ def get_seasonal_multiplier(category: str, month: int) -> float:
     return category_multipliers.get(category, 1.0)
 
 
+@lru_cache(maxsize=1)
+def _get_month_to_season(version: Tuple) -> Dict[int, str]:
+    """Season name by month, inverted once per static data version from the seasons' month lists."""
+    month_to_season = {}
+    for season_name, season_info in _seasonal_patterns().get('seasons', {}).items():
+        for month in season_info.get('months', []):
+            # First season listing a month wins, as in the original scan
+            month_to_season.setdefault(month, season_name)
+    return month_to_season
+
+
 def get_festival_impact(festival_name: str) -> Optional[Dict[str, Any]]:
     """
     Get impact information for a specific festival.
@@ -253,7 +397,7 @@ def get_festival_impact(festival_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Festival impact dictionary or None if not found
     """
-    festivals_data = load_festival_calendar()
+    festivals_data = _festival_calendar()
 
     for festival in festivals_data.get('festivals', []):
         if festival.get('name', '').lower() == festival_name.lower():
@@ -261,7 +405,7 @@ def get_festival_impact(festival_name: str) -> Optional[Dict[str, Any]]:
                 'name': festival.get('name'),
                 'demand_multiplier': festival.get('demand_multiplier', 1.0),
                 'impact_window_days': festival.get('impact_window_days', 7),
-                'impact_categories': festival.get('impact_categories', []),
+                'impact_categories': list(festival.get('impact_categories', [])),
                 'type': festival.get('type'),
                 'region': festival.get('region')
             }
@@ -284,7 +428,7 @@ def get_day_of_week_multiplier(weekday: int) -> float:
     if weekday < 0 or weekday > 6:
         return 1.0
 
-    seasonal_data = load_seasonal_patterns()
+    seasonal_data = _seasonal_patterns()
     day_patterns = seasonal_data.get('day_of_week_patterns', {})
 
     return day_patterns.get(days[weekday], 1.0)
@@ -303,7 +447,7 @@ def get_month_multiplier(month: int) -> float:
     if month < 1 or month > 12:
         return 1.0
 
-    seasonal_data = load_seasonal_patterns()
+    seasonal_data = _seasonal_patterns()
     month_patterns = seasonal_data.get('month_patterns', {})
 
     return month_patterns.get(str(month), 1.0)
@@ -319,19 +463,27 @@ def get_weather_impact(weather_code: str) -> float:
     Returns:
         Impact multiplier
     """
-    seasonal_data = load_seasonal_patterns()
-    weather_impact = seasonal_data.get('weather_impact', {})
-
     # Normalize weather code
-    weather_code_normalized = weather_code.lower().replace('_', ' ')
+    return _get_weather_impact_normalized(weather_code.lower().replace('_', ' '), get_static_data_version())
+
 
-    for key, multiplier in weather_impact.items():
-        if key.lower() in weather_code_normalized:
+@lru_cache(maxsize=256)
+def _get_weather_impact_normalized(weather_code_normalized: str, version: Tuple) -> float:
+    """Weather impact for a normalized code; only a few distinct codes occur, so results are memoized."""
+    for key, multiplier in _get_weather_impact_patterns(version):
+        if key in weather_code_normalized:
             return multiplier
 
     return 1.0
 
 
+@lru_cache(maxsize=1)
+def _get_weather_impact_patterns(version: Tuple) -> Tuple[Tuple[str, Any], ...]:
+    """Weather impact keys lowercased once per static data version, in file order (the first matching key wins)."""
+    weather_impact = _seasonal_patterns().get('weather_impact', {})
+    return tuple((key.lower(), multiplier) for key, multiplier in weather_impact.items())
+
+
 def get_temperature_impact(temperature_celsius: float) -> float:
     """
     Get demand impact factor for temperature.
@@ -342,25 +494,29 @@ def get_temperature_impact(temperature_celsius: float) -> float:
     Returns:
         Impact multiplier
     """
-    seasonal_data = load_seasonal_patterns()
+    seasonal_data = _seasonal_patterns()
     temp_impact = seasonal_data.get('temperature_impact', {})
 
-    if temperature_celsius < 10:
-        return temp_impact.get('below_10', 1.0)
-    elif temperature_celsius < 15:
-        return temp_impact.get('10_to_15', 1.0)
-    elif temperature_celsius < 20:
-        return temp_impact.get('15_to_20', 1.0)
-    elif temperature_celsius < 25:
-        return temp_impact.get('20_to_25', 1.0)
-    elif temperature_celsius < 30:
-        return temp_impact.get('25_to_30', 1.0)
-    elif temperature_celsius < 35:
-        return temp_impact.get('30_to_35', 1.0)
-    elif temperature_celsius < 40:
-        return temp_impact.get('35_to_40', 1.0)
-    else:
-        return temp_impact.get('above_40', 1.0)
+    bucket = TEMPERATURE_BUCKETS[bisect_right(TEMPERATURE_BINS, temperature_celsius)]
+    return temp_impact.get(bucket, 1.0)
+
+
+def get_temperature_impact_batch(temperatures_celsius: np.ndarray) -> np.ndarray:
+    """
+    Get demand impact factors for many temperatures at once.
+
+    Args:
+        temperatures_celsius: Array of temperatures in Celsius
+
+    Returns:
+        Array of impact multipliers, parallel to the input
+    """
+    seasonal_data = _seasonal_patterns()
+    temp_impact = seasonal_data.get('temperature_impact', {})
+
+    multipliers = np.array([temp_impact.get(bucket, 1.0) for bucket in TEMPERATURE_BUCKETS], dtype=float)
+    buckets = np.searchsorted(TEMPERATURE_BINS, np.asarray(temperatures_celsius, dtype=float), side='right')
+    return multipliers[buckets]
 
 
 def get_product_lifecycle_multiplier(created_date: datetime) -> float:
@@ -374,27 +530,142 @@ def get_product_lifecycle_multiplier(created_date: datetime) -> float:
         Lifecycle multiplier
     """
     days_since_launch = (timezone.now() - created_date).days
-    seasonal_data = load_seasonal_patterns()
-    lifecycle_phases = seasonal_data.get('product_lifecycle_phases', {})
 
+    for start, end, multiplier in _get_lifecycle_phase_ranges(get_static_data_version()):
+        if start <= days_since_launch and (end is None or days_since_launch <= end):
+            return multiplier
+
+    return 1.0
+
+
+@lru_cache(maxsize=1)
+def _get_lifecycle_phase_ranges(version: Tuple) -> Tuple[Tuple[int, Optional[int], float], ...]:
+    """
+    Lifecycle phases parsed once per static data version into (start, end, multiplier), in file order
+    (the first matching phase wins). end is None for open-ended phases.
+    """
+    lifecycle_phases = _seasonal_patterns().get('product_lifecycle_phases', {})
+
+    phase_ranges = []
     for phase_name, phase_info in lifecycle_phases.items():
         days_range = phase_info.get('days_from_created', '0-30')
-        start, end = map(int, days_range.split('-'))
+        try:
+            if days_range.endswith('+'):  # e.g. '730+'
+                start, end = int(days_range[:-1]), None
+            else:
+                start, end = map(int, days_range.split('-'))
+                if end == 730:  # 'mature' phase
+                    end = None
+        except ValueError:
+            continue
+
+        phase_ranges.append((start, end, phase_info.get('demand_multiplier', 1.0)))
+
+    return tuple(phase_ranges)
+
+
+# Cache lifetimes per upstream endpoint, in seconds, matched to how often the
+# data actually changes. None caches forever.
+CACHE_TTLS = {
+    'interest': 86400,  # 1 day
+    'related': 86400 * 7,  # 7 days
+    'trending': 3600,  # 1 hour
+    'weather_current': 600,  # 10 minutes
+    'weather_forecast': 3600,  # 1 hour
+    'weather_historical': None,  # Settled archive windows only (see HISTORICAL_SETTLED_DAYS)
+    'geocode': None,
+}
+
+# Cached in place of None results so a failing upstream lookup isn't retried on every call
+CACHE_MISS_SENTINEL = {'_miss': True}
+NEGATIVE_CACHE_TIMEOUT = 300  # 5 minutes
+
+# Fetches currently running in this process, by cache key
+_inflight_fetches: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def get_or_fetch_cached(
+    cache_key: str,
+    fetch: Callable[[], Any],
+    timeout: Optional[int],
+    negative_timeout: int = NEGATIVE_CACHE_TIMEOUT
+) -> Any:
+    """
+    Get a cached value, computing it with fetch() on a miss.
+    Results are stored with cache.get_or_set, so when concurrent misses race
+    the first stored value wins. None results are cached briefly as a miss
+    sentinel so failed lookups don't hit the upstream API again right away.
+    Concurrent misses for the same key within this process share a single
+    fetch() call.
 
-        if end == 730:  # 'mature' phase
-            if days_since_launch >= start:
-                return phase_info.get('demand_multiplier', 1.0)
-        else:
-            if start <= days_since_launch <= end:
-                return phase_info.get('demand_multiplier', 1.0)
+    Args:
+        cache_key: Cache key
+        fetch: Callable returning the value, or None on failure
+        timeout: Cache timeout in seconds for successful results (None caches forever)
+        negative_timeout: Cache timeout in seconds for None results
 
-    return 1.0
+    Returns:
+        Cached or freshly fetched value, or None
+    """
+    value = cache.get(cache_key)
+    if value is None:
+        return _fetch_and_cache_once(cache_key, fetch, timeout, negative_timeout)
+
+    if value == CACHE_MISS_SENTINEL:
+        return None
+
+    return value
+
+
+def _fetch_and_cache_once(
+    cache_key: str,
+    fetch: Callable[[], Any],
+    timeout: Optional[int],
+    negative_timeout: int
+) -> Any:
+    """
+    Run fetch() and cache its result, unless the same key is already being
+    fetched in this process, in which case wait for that result instead.
+    """
+    with _inflight_lock:
+        future = _inflight_fetches.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight_fetches[cache_key] = future
+
+    if not is_owner:
+        return future.result()
+
+    try:
+        value = fetch()
+        if value is None:
+            cache.set(cache_key, CACHE_MISS_SENTINEL, negative_timeout)
+        else:
+            value = cache.get_or_set(cache_key, value, timeout)
+            if value == CACHE_MISS_SENTINEL:
+                value = None
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_fetches.pop(cache_key, None)
 
 
 def clear_static_data_cache():
-    """Clear all cached static data."""
-    cache.delete("forecasting:festivals:calendar")
-    cache.delete("forecasting:seasonal:patterns")
+    """Clear all cached static data (shared cache and this process's memoized copies)."""
+    cache.delete_many([FESTIVAL_CACHE_KEY, SEASONAL_CACHE_KEY])
+    _parse_json_file.cache_clear()
+    _load_all_static_data_memoized.cache_clear()
+    _get_month_to_season.cache_clear()
+    _get_festival_date_index.cache_clear()
+    _get_weather_impact_patterns.cache_clear()
+    _get_weather_impact_normalized.cache_clear()
+    _get_lifecycle_phase_ranges.cache_clear()
     return True
 
 
@@ -405,15 +676,16 @@ def get_all_static_data_info() -> Dict[str, Any]:
     Returns:
         Dictionary with data availability info
     """
+    static_data = load_all_static_data()
     return {
         'festivals': {
             'loaded': True,
-            'festivals_count': len(load_festival_calendar().get('festivals', [])),
-            'cache_ttl': 86400
+            'festivals_count': len(static_data['festivals'].get('festivals', [])),
+            'cache_ttl': STATIC_DATA_CACHE_TIMEOUT
         },
         'seasonal_patterns': {
             'loaded': True,
-            'seasons_count': len(load_seasonal_patterns().get('seasons', {})),
-            'cache_ttl': 86400
+            'seasons_count': len(static_data['seasonal_patterns'].get('seasons', {})),
+            'cache_ttl': STATIC_DATA_CACHE_TIMEOUT
         }
     }
@@ -0,0 +1,179 @@
+"""
+Tests for static data helpers and the shared fetch cache in forecasting.utils.data_loaders.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from forecasting.utils import data_loaders
+from forecasting.utils.data_loaders import (
+    CACHE_MISS_SENTINEL,
+    get_or_fetch_cached,
+    get_product_lifecycle_multiplier,
+    get_temperature_impact,
+    get_temperature_impact_batch,
+)
+
+LIFECYCLE_PHASES = {
+    'launch': {'days_from_created': '0-30', 'demand_multiplier': 1.3},
+    'growth': {'days_from_created': '30-180', 'demand_multiplier': 1.5},
+    'maturity': {'days_from_created': '180-730', 'demand_multiplier': 1.0},
+    'decline': {'days_from_created': '730+', 'demand_multiplier': 0.7},
+}
+
+TEMPERATURE_IMPACT = {
+    'below_10': 0.8,
+    '10_to_15': 0.9,
+    '30_to_35': 1.2,
+    'above_40': 0.6,
+}
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class LifecyclePhaseTests(SimpleTestCase):
+    """Lifecycle phases are parsed once per static data version, first match wins."""
+
+    def setUp(self):
+        data_loaders._get_lifecycle_phase_ranges.cache_clear()
+        self.addCleanup(data_loaders._get_lifecycle_phase_ranges.cache_clear)
+
+        patcher = mock.patch.object(
+            data_loaders,
+            '_seasonal_patterns',
+            return_value={'product_lifecycle_phases': LIFECYCLE_PHASES}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(data_loaders, 'get_static_data_version', return_value=('test', 0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_phase_ranges(self):
+        ranges = data_loaders._get_lifecycle_phase_ranges(('test', 0))
+
+        self.assertEqual(ranges, (
+            (0, 30, 1.3),
+            (30, 180, 1.5),
+            (180, None, 1.0),  # an end of 730 is open-ended ('mature' phase)
+            (730, None, 0.7),  # '730+'
+        ))
+
+    def test_unparseable_ranges_are_skipped(self):
+        with mock.patch.object(
+            data_loaders,
+            '_seasonal_patterns',
+            return_value={'product_lifecycle_phases': {
+                'bad': {'days_from_created': 'soon', 'demand_multiplier': 2.0},
+                'launch': {'days_from_created': '0-30', 'demand_multiplier': 1.3},
+            }}
+        ):
+            ranges = data_loaders._get_lifecycle_phase_ranges(('other', 0))
+
+        self.assertEqual(ranges, ((0, 30, 1.3),))
+
+    def test_multiplier_by_age(self):
+        now = timezone.now()
+
+        self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=10)), 1.3)
+        self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=30)), 1.3)
+        self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=100)), 1.5)
+        # The open-ended maturity phase comes first, so it also covers 730+ days
+        self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=730)), 1.0)
+        self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=900)), 1.0)
+
+    def test_decline_applies_without_open_ended_maturity(self):
+        phases = {
+            'maturity': {'days_from_created': '180-729', 'demand_multiplier': 1.0},
+            'decline': {'days_from_created': '730+', 'demand_multiplier': 0.7},
+        }
+        with mock.patch.object(
+            data_loaders,
+            '_seasonal_patterns',
+            return_value={'product_lifecycle_phases': phases}
+        ):
+            now = timezone.now()
+            self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=729)), 1.0)
+            self.assertEqual(get_product_lifecycle_multiplier(now - timedelta(days=730)), 0.7)
+
+
+class TemperatureImpactTests(SimpleTestCase):
+    """Temperatures map to buckets with upper-exclusive bounds; unknown buckets are neutral."""
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            data_loaders,
+            '_seasonal_patterns',
+            return_value={'temperature_impact': TEMPERATURE_IMPACT}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bucket_boundaries(self):
+        self.assertEqual(get_temperature_impact(9.9), 0.8)
+        self.assertEqual(get_temperature_impact(10), 0.9)
+        self.assertEqual(get_temperature_impact(14.9), 0.9)
+        self.assertEqual(get_temperature_impact(22), 1.0)
+        self.assertEqual(get_temperature_impact(30), 1.2)
+        self.assertEqual(get_temperature_impact(35), 1.0)
+        self.assertEqual(get_temperature_impact(40), 0.6)
+
+    def test_batch_matches_scalar(self):
+        temperatures = np.array([-5, 9.9, 10, 12.5, 15, 24.9, 30, 34.99, 35, 39, 40, 48])
+
+        impacts = get_temperature_impact_batch(temperatures)
+
+        self.assertEqual(impacts.shape, temperatures.shape)
+        self.assertEqual(list(impacts), [get_temperature_impact(t) for t in temperatures])
+
+    def test_batch_without_configured_impacts(self):
+        with mock.patch.object(data_loaders, '_seasonal_patterns', return_value={}):
+            impacts = get_temperature_impact_batch(np.array([5.0, 25.0, 45.0]))
+
+        self.assertEqual(list(impacts), [1.0, 1.0, 1.0])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GetOrFetchCachedTests(SimpleTestCase):
+    """get_or_fetch_cached stores results and briefly remembers failed lookups."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fetches_once_then_serves_cache(self):
+        fetch = mock.Mock(return_value={'lat': 19.07})
+
+        self.assertEqual(get_or_fetch_cached('test:key', fetch, 60), {'lat': 19.07})
+        self.assertEqual(get_or_fetch_cached('test:key', fetch, 60), {'lat': 19.07})
+        fetch.assert_called_once_with()
+
+    def test_failed_fetch_is_negatively_cached(self):
+        fetch = mock.Mock(return_value=None)
+
+        self.assertIsNone(get_or_fetch_cached('test:missing', fetch, 60))
+        self.assertIsNone(get_or_fetch_cached('test:missing', fetch, 60))
+        fetch.assert_called_once_with()
+        self.assertEqual(cache.get('test:missing'), CACHE_MISS_SENTINEL)
+
+    def test_first_stored_value_wins(self):
+        def fetch():
+            # Another worker stores the key while this fetch is running
+            cache.set('test:race', 'stored-by-another-worker', 60)
+            return 'mine'
+
+        self.assertEqual(get_or_fetch_cached('test:race', fetch, 60), 'stored-by-another-worker')
+
+    def test_fetch_errors_propagate_and_are_not_cached(self):
+        fetch = mock.Mock(side_effect=RuntimeError('upstream down'))
+
+        with self.assertRaises(RuntimeError):
+            get_or_fetch_cached('test:error', fetch, 60)
+
+        self.assertIsNone(cache.get('test:error'))
+        self.assertEqual(data_loaders._inflight_fetches, {})
@@ -0,0 +1,65 @@
+"""
+Tests for the vectorized sales trend calculation in FeatureEngineer.
+"""
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from forecasting.services.feature_engineering import FeatureEngineer
+
+
+class CalculateTrendMatrixTests(SimpleTestCase):
+    """_calculate_trend_matrix must match the per-SKU _calculate_trend semantics."""
+
+    def test_trend_direction(self):
+        matrix = np.array([
+            [1.0, 1.0, 5.0, 5.0],  # second half well above the first
+            [5.0, 5.0, 1.0, 1.0],  # second half well below the first
+            [4.0, 4.0, 4.2, 4.2],  # within the +/-10% band
+        ])
+
+        trends, _ = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertEqual(list(trends), ['increasing', 'decreasing', 'stable'])
+
+    def test_gaps_do_not_shift_the_split(self):
+        # Present values are [1, 1, 5, 5]; halves are split by rank, not by column
+        matrix = np.array([[np.nan, 1.0, np.nan, 1.0, 5.0, np.nan, 5.0]])
+
+        trends, volatility = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertEqual(trends[0], 'increasing')
+        self.assertAlmostEqual(volatility[0], np.std([1.0, 1.0, 5.0, 5.0], ddof=1))
+
+    def test_odd_count_puts_middle_value_in_second_half(self):
+        # count // 2 == 1: first half [10], second half [10, 13] -> +15%
+        matrix = np.array([[10.0, 10.0, 13.0]])
+
+        trends, _ = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertEqual(trends[0], 'increasing')
+
+    def test_zero_first_half_is_stable(self):
+        matrix = np.array([[0.0, 0.0, 3.0, 3.0]])
+
+        trends, _ = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertEqual(trends[0], 'stable')
+
+    def test_sparse_rows_are_stable_with_zero_volatility(self):
+        matrix = np.array([
+            [np.nan, 7.0, np.nan],
+            [np.nan, np.nan, np.nan],
+        ])
+
+        trends, volatility = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertEqual(list(trends), ['stable', 'stable'])
+        self.assertEqual(list(volatility), [0.0, 0.0])
+
+    def test_volatility_is_sample_std_of_present_values(self):
+        matrix = np.array([[2.0, np.nan, 4.0, 9.0, np.nan, 1.0]])
+
+        _, volatility = FeatureEngineer._calculate_trend_matrix(matrix)
+
+        self.assertAlmostEqual(volatility[0], np.std([2.0, 4.0, 9.0, 1.0], ddof=1))
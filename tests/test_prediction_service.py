@@ -0,0 +1,56 @@
+"""
+Tests for the stale-while-revalidate forecast cache entries in PredictionService.
+"""
+
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from forecasting.services.prediction_service import PredictionService
+
+
+class ForecastCacheEntryTests(SimpleTestCase):
+    """Fresh entries are served as-is, stale ones trigger a background refresh, expired ones miss."""
+
+    def setUp(self):
+        patcher = mock.patch.object(PredictionService, '_schedule_forecast_refresh')
+        self.schedule_refresh = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read(self, entry):
+        return PredictionService._read_forecast_cache_entry('forecast:demand:SKU1:7', entry, 'SKU1', 7)
+
+    def test_fresh_entry_is_served_without_refresh(self):
+        entry = PredictionService._make_forecast_cache_entry({'sku': 'SKU1'})
+
+        self.assertEqual(self.read(entry), {'sku': 'SKU1'})
+        self.schedule_refresh.assert_not_called()
+
+    def test_stale_entry_is_served_and_refreshed(self):
+        now = time.time()
+        entry = {'value': {'sku': 'SKU1'}, 'fresh_until': now - 1, 'stale_until': now + 60}
+
+        self.assertEqual(self.read(entry), {'sku': 'SKU1'})
+        self.schedule_refresh.assert_called_once_with('forecast:demand:SKU1:7', 'SKU1', 7)
+
+    def test_expired_entry_is_a_miss(self):
+        now = time.time()
+        entry = {'value': {'sku': 'SKU1'}, 'fresh_until': now - 120, 'stale_until': now - 60}
+
+        self.assertIsNone(self.read(entry))
+        self.schedule_refresh.assert_not_called()
+
+    def test_missing_or_unwrapped_entry_is_a_miss(self):
+        self.assertIsNone(self.read(None))
+        self.assertIsNone(self.read({'sku': 'SKU1', 'forecasts': []}))
+        self.schedule_refresh.assert_not_called()
+
+    def test_error_fallback_is_detected(self):
+        fallback = {'forecasts': [{'influencing_factors': ['Error in forecast generation']}]}
+        forecast = {'forecasts': [{'influencing_factors': ['Base demand']}]}
+
+        self.assertTrue(PredictionService._is_error_fallback(fallback))
+        self.assertFalse(PredictionService._is_error_fallback(forecast))
+        # A missing forecast is treated like the placeholder (never cached)
+        self.assertTrue(PredictionService._is_error_fallback(None))
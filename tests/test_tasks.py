@@ -0,0 +1,93 @@
+"""
+Tests for the bulk create-or-update helper used by the collection and forecasting tasks.
+"""
+
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from forecasting import tasks
+from forecasting.tasks import _bulk_upsert
+
+
+def make_model(existing, auto_now_fields=('updated_at',)):
+    """Mock model class whose manager returns `existing` and whose instances are namespaces."""
+    model = mock.Mock(side_effect=lambda **row: SimpleNamespace(**row))
+    model.objects.filter.return_value = existing
+    model._meta.concrete_fields = [
+        SimpleNamespace(name=name, auto_now=True) for name in auto_now_fields
+    ] + [SimpleNamespace(name='value', auto_now=False)]
+    return model
+
+
+class BulkUpsertTests(SimpleTestCase):
+    """_bulk_upsert splits rows into one bulk_update and one bulk_create."""
+
+    def setUp(self):
+        patcher = mock.patch.object(tasks.transaction, 'atomic', return_value=nullcontext())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_no_rows_skips_queries(self):
+        model = make_model([])
+
+        self.assertEqual(_bulk_upsert(model, [], ('data_type',), ('value',)), 0)
+        model.objects.filter.assert_not_called()
+
+    def test_updates_existing_and_creates_missing(self):
+        existing = SimpleNamespace(data_type='weather', location_code='Mumbai', value=1.0, updated_at=None)
+        model = make_model([existing])
+        rows = [
+            {'data_type': 'weather', 'location_code': 'Mumbai', 'value': 2.0},
+            {'data_type': 'weather', 'location_code': 'Delhi', 'value': 3.0},
+        ]
+
+        written = _bulk_upsert(model, rows, ('data_type', 'location_code'), ('value',))
+
+        self.assertEqual(written, 2)
+        model.objects.filter.assert_called_once_with(
+            data_type__in={'weather'},
+            location_code__in={'Mumbai', 'Delhi'}
+        )
+
+        updated, update_fields = model.objects.bulk_update.call_args.args
+        self.assertEqual(updated, [existing])
+        self.assertEqual(update_fields, ['value', 'updated_at'])
+        self.assertEqual(existing.value, 2.0)
+        self.assertIsNotNone(existing.updated_at)
+
+        created = model.objects.bulk_create.call_args.args[0]
+        self.assertEqual([vars(obj) for obj in created], [
+            {'data_type': 'weather', 'location_code': 'Delhi', 'value': 3.0}
+        ])
+
+    def test_later_rows_win_for_duplicate_keys(self):
+        model = make_model([])
+        rows = [
+            {'data_type': 'trends', 'product_code': 'toys', 'value': 40},
+            {'data_type': 'trends', 'product_code': 'toys', 'value': 55},
+        ]
+
+        written = _bulk_upsert(model, rows, ('data_type', 'product_code'), ('value',))
+
+        self.assertEqual(written, 1)
+        created = model.objects.bulk_create.call_args.args[0]
+        self.assertEqual([obj.value for obj in created], [55])
+        model.objects.bulk_update.assert_not_called()
+
+    def test_candidates_matching_only_some_key_fields_are_not_updated(self):
+        # The IN filters can match cross-combinations; only exact key tuples count
+        other = SimpleNamespace(data_type='weather', location_code='Delhi', value=1.0, updated_at=None)
+        model = make_model([other])
+        rows = [
+            {'data_type': 'weather', 'location_code': 'Mumbai', 'value': 2.0},
+            {'data_type': 'festival', 'location_code': 'Delhi', 'value': 1.5},
+        ]
+
+        _bulk_upsert(model, rows, ('data_type', 'location_code'), ('value',))
+
+        model.objects.bulk_update.assert_not_called()
+        self.assertEqual(len(model.objects.bulk_create.call_args.args[0]), 2)
+        self.assertEqual(other.value, 1.0)
@@ -0,0 +1,64 @@
+"""
+Tests for the process-wide request spacing in the Google Trends service.
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from forecasting.services import trends_service
+from forecasting.services.trends_service import _RequestSpacer
+
+
+class FakeClock:
+    """Stands in for the time module: monotonic() returns the current value, sleep() advances it."""
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RequestSpacerTests(SimpleTestCase):
+    """_RequestSpacer hands out request slots at least one interval apart."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(trends_service, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_first_request_does_not_wait(self):
+        _RequestSpacer(3).acquire()
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_back_to_back_requests_are_spaced(self):
+        spacer = _RequestSpacer(3)
+
+        for _ in range(3):
+            spacer.acquire()
+
+        self.assertEqual(self.clock.sleeps, [3, 3])
+
+    def test_idle_time_counts_towards_the_interval(self):
+        spacer = _RequestSpacer(3)
+        spacer.acquire()
+
+        self.clock.now += 2
+        spacer.acquire()
+
+        self.assertEqual(self.clock.sleeps, [1])
+
+    def test_collectors_share_the_module_limiter(self):
+        with mock.patch.object(trends_service, '_trends_rate_limiter', _RequestSpacer(3)):
+            trends_service.GoogleTrendsCollector()._apply_rate_limit()
+            trends_service.GoogleTrendsCollector(geo='US')._apply_rate_limit()
+
+        self.assertEqual(self.clock.sleeps, [3])
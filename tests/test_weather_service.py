@@ -0,0 +1,103 @@
+"""
+Tests for the request pacing and date-range helpers in the weather service.
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from forecasting.services import weather_service
+from forecasting.services.weather_service import WeatherDataCollector, _TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: monotonic() returns the current value, sleep() advances it."""
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SplitDateRangeTests(SimpleTestCase):
+    """_split_date_range covers an inclusive range with consecutive, non-overlapping windows."""
+
+    def test_range_within_one_window(self):
+        self.assertEqual(
+            WeatherDataCollector._split_date_range('2024-01-01', '2024-01-31', 90),
+            [('2024-01-01', '2024-01-31')]
+        )
+
+    def test_single_day(self):
+        self.assertEqual(
+            WeatherDataCollector._split_date_range('2024-03-05', '2024-03-05', 90),
+            [('2024-03-05', '2024-03-05')]
+        )
+
+    def test_exact_multiple_of_window(self):
+        self.assertEqual(
+            WeatherDataCollector._split_date_range('2024-01-01', '2024-01-06', 3),
+            [('2024-01-01', '2024-01-03'), ('2024-01-04', '2024-01-06')]
+        )
+
+    def test_last_window_is_shorter(self):
+        self.assertEqual(
+            WeatherDataCollector._split_date_range('2023-12-30', '2024-01-05', 3),
+            [('2023-12-30', '2024-01-01'), ('2024-01-02', '2024-01-04'), ('2024-01-05', '2024-01-05')]
+        )
+
+    def test_reversed_range_is_empty(self):
+        self.assertEqual(WeatherDataCollector._split_date_range('2024-02-01', '2024-01-01', 90), [])
+
+    def test_invalid_date_raises(self):
+        with self.assertRaises(ValueError):
+            WeatherDataCollector._split_date_range('2024-13-01', '2024-12-31', 90)
+
+
+class TokenBucketTests(SimpleTestCase):
+    """_TokenBucket allows a burst up front, then one request per 1 / rate seconds."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(weather_service, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_does_not_wait(self):
+        bucket = _TokenBucket(rate=10, capacity=3)
+
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_waits_for_tokens_after_burst(self):
+        bucket = _TokenBucket(rate=10, capacity=2)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(len(self.clock.sleeps), 2)
+        for seconds in self.clock.sleeps:
+            self.assertAlmostEqual(seconds, 0.1)
+
+    def test_tokens_refill_up_to_capacity(self):
+        bucket = _TokenBucket(rate=10, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        # Idle long enough to refill many times over; only capacity tokens accrue
+        self.clock.now += 60
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+        bucket.acquire()
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[0], 0.1)